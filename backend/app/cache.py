@@ -0,0 +1,68 @@
+# backend/app/cache.py
+from collections import OrderedDict
+from threading import Lock
+
+
+class LRUCache:
+    """
+    Thread-safe LRU cache bounded by total size.
+    `sizeof(value)` gives each entry's weight (default 1, i.e. bounded by entry count).
+    """
+
+    def __init__(self, maxsize: int, sizeof=None):
+        self.maxsize = maxsize
+        self.sizeof = sizeof or (lambda value: 1)
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value, _ = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        weight = self.sizeof(value)
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.size -= old[1]
+            if weight > self.maxsize:
+                return  # would evict everything else; don't cache it
+            self._data[key] = (value, weight)
+            self.size += weight
+            while self.size > self.maxsize:
+                _, (_, evicted) = self._data.popitem(last=False)
+                self.size -= evicted
+
+    def pop(self, key):
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.size -= old[1]
+                return old[0]
+            return None
+
+    def values(self) -> list:
+        """Cached values, least recently used first"""
+        with self._lock:
+            return [value for value, _ in self._data.values()]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.size = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
@@ -1,8 +1,78 @@
 # backend/app/db.py
-from sqlalchemy import create_engine
+import os
+import time
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import sessionmaker, declarative_base
 
-SQLALCHEMY_DATABASE_URL = "sqlite:///./resume_relevance.db"
-engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+# Every uvicorn worker must point at the same database so JDs are shared
+SQLALCHEMY_DATABASE_URL = os.environ.get("DATABASE_URL", "sqlite:///./resume_relevance.db")
+
+# Connection pool per process (file databases only; in-memory SQLite keeps SQLAlchemy's default)
+DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = float(os.environ.get("DB_POOL_TIMEOUT", "30"))
+SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+
+_is_sqlite = SQLALCHEMY_DATABASE_URL.startswith("sqlite")
+_in_memory = _is_sqlite and (SQLALCHEMY_DATABASE_URL in ("sqlite://", "sqlite:///") or ":memory:" in SQLALCHEMY_DATABASE_URL)
+_engine_kwargs = {} if _in_memory else {
+    "pool_size": DB_POOL_SIZE, "max_overflow": DB_MAX_OVERFLOW, "pool_timeout": DB_POOL_TIMEOUT}
+engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False} if _is_sqlite else {},
+                       **_engine_kwargs)
+
+if _is_sqlite:
+    @event.listens_for(engine, "connect")
+    def _sqlite_pragmas(dbapi_connection, connection_record):
+        """
+        WAL lets readers (leaderboards, exports) run alongside the writer and across
+        uvicorn workers; writers wait up to busy_timeout instead of failing with "database is locked".
+        """
+        cursor = dbapi_connection.cursor()
+        if not _in_memory:
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")  # durable with WAL except on power loss
+        cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA cache_size=-16000")  # ~16 MB page cache per connection
+        cursor.close()
+
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
 Base = declarative_base()
+
+def _add_missing_columns():
+    """create_all() never alters existing tables; add columns introduced since they were created"""
+    existing_tables = inspect(engine).get_table_names()
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            existing = {c["name"] for c in inspect(conn).get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                col_type = column.type.compile(engine.dialect)
+                conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {col_type}'))
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
+
+def init_db():
+    from . import models  # noqa: F401  (register tables on Base)
+    # Several uvicorn workers start at once; on a fresh database another worker can create
+    # a table between the existence check and CREATE TABLE, so retry and the check sees it
+    for attempt in range(3):
+        try:
+            _add_missing_columns()
+            Base.metadata.create_all(bind=engine)
+            return
+        except OperationalError:
+            if attempt == 2:
+                raise
+            time.sleep(0.1 * (attempt + 1))
+
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
@@ -0,0 +1,93 @@
+# backend/app/evaluations.py
+# Reading stored evaluations back: paginated history, per-JD leaderboards and a
+# streaming CSV export. Every query is served by an index on Evaluation (see models.py).
+import csv
+import io
+import json
+from typing import Iterator, Optional
+
+from sqlalchemy.orm import Session
+
+from .db import SessionLocal
+from .models import Evaluation, Resume
+
+EXPORT_BATCH = 1000  # rows fetched from the database and written per CSV chunk
+LEADERBOARD_ORDER = {"score": Evaluation.score, "final_score": Evaluation.final_score}
+CSV_COLUMNS = ["evaluation_id", "jd_id", "resume_id", "filename", "score", "verdict", "final_score",
+               "semantic_score", "matched_skills", "missing_skills", "created_at"]
+
+
+def _as_dict(ev: Evaluation, filename: Optional[str]) -> dict:
+    return {
+        "evaluation_id": ev.id,
+        "jd_id": ev.jd_id,
+        "resume_id": ev.resume_id,
+        "filename": filename,
+        "score": int(ev.score),
+        "verdict": ev.verdict,
+        "matched_skills": json.loads(ev.matched_skills or "[]"),
+        "missing_skills": json.loads(ev.missing_skills or "[]"),
+        "semantic_score": ev.semantic_score,
+        "final_score": ev.final_score,
+        "created_at": ev.created_at.isoformat() if ev.created_at else None,
+    }
+
+
+def _query(db: Session, jd_id: Optional[int], verdict: Optional[str]):
+    query = db.query(Evaluation, Resume.filename).outerjoin(Resume, Resume.id == Evaluation.resume_id)
+    if jd_id is not None:
+        query = query.filter(Evaluation.jd_id == jd_id)
+    if verdict:
+        query = query.filter(Evaluation.verdict == verdict)
+    return query
+
+
+def history(db: Session, jd_id: Optional[int] = None, verdict: Optional[str] = None,
+            before_id: Optional[int] = None, limit: int = 100) -> dict:
+    """
+    Newest evaluations first. Paginated by id (keyset), so deep pages cost the
+    same as the first: pass the returned next_before_id to get the next page.
+    """
+    query = _query(db, jd_id, verdict)
+    if before_id is not None:
+        query = query.filter(Evaluation.id < before_id)
+    rows = query.order_by(Evaluation.id.desc()).limit(limit).all()
+    return {
+        "results": [_as_dict(ev, filename) for ev, filename in rows],
+        "next_before_id": rows[-1][0].id if len(rows) == limit else None,
+    }
+
+
+def leaderboard(db: Session, jd_id: int, verdict: Optional[str] = None, order_by: str = "score",
+                limit: int = 10, offset: int = 0) -> list:
+    """Top evaluations of a JD by score (or final_score), ties newest first"""
+    column = LEADERBOARD_ORDER[order_by]
+    rows = (_query(db, jd_id, verdict)
+            .filter(column.isnot(None))
+            .order_by(column.desc(), Evaluation.id.desc())
+            .offset(offset)
+            .limit(limit)
+            .all())
+    return [{"rank": offset + i + 1, **_as_dict(ev, filename)} for i, (ev, filename) in enumerate(rows)]
+
+
+def export_csv(jd_id: Optional[int] = None, verdict: Optional[str] = None) -> Iterator[str]:
+    """
+    CSV of matching evaluations in id order, yielded in chunks of EXPORT_BATCH rows.
+    Uses its own session, since the response is still streaming after the endpoint returns.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(CSV_COLUMNS)
+    with SessionLocal() as db:
+        query = _query(db, jd_id, verdict).order_by(Evaluation.id).yield_per(EXPORT_BATCH)
+        for n, (ev, filename) in enumerate(query, 1):
+            row = _as_dict(ev, filename)
+            row["matched_skills"] = "; ".join(row["matched_skills"])
+            row["missing_skills"] = "; ".join(row["missing_skills"])
+            writer.writerow([row[c] for c in CSV_COLUMNS])
+            if n % EXPORT_BATCH == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+    yield buffer.getvalue()
@@ -0,0 +1,143 @@
+# backend/app/extraction.py
+# Upload text extraction: parses PDF/DOCX from memory on a bounded process pool
+import hashlib
+import os
+import time
+from concurrent.futures import FIRST_EXCEPTION, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from threading import Lock
+
+from .cache import LRUCache
+from .utils_parse import extract_pdf_pages, extract_text_from_docx_bytes
+
+EXTRACT_WORKERS = int(os.environ.get("EXTRACT_WORKERS", str(os.cpu_count() or 1)))
+EXTRACT_TIMEOUT = float(os.environ.get("EXTRACT_TIMEOUT", "20"))  # seconds per document
+MAX_PAGES = int(os.environ.get("EXTRACT_MAX_PAGES", "50"))  # later pages are ignored
+PAGES_PER_TASK = int(os.environ.get("EXTRACT_PAGES_PER_TASK", "8"))
+# Bound on the total characters of cached text
+TEXT_CACHE_MAX_CHARS = int(os.environ.get("TEXT_CACHE_MAX_CHARS", "50000000"))
+
+
+class ExtractionError(ValueError):
+    pass
+
+
+class ExtractionTimeout(ExtractionError):
+    pass
+
+
+_POOL = None
+_POOL_LOCK = Lock()
+_TEXT_CACHE = LRUCache(TEXT_CACHE_MAX_CHARS, sizeof=lambda text: max(1, len(text)))
+
+
+def get_pool() -> ProcessPoolExecutor:
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = ProcessPoolExecutor(max_workers=EXTRACT_WORKERS)
+        return _POOL
+
+
+def shutdown():
+    global _POOL
+    with _POOL_LOCK:
+        pool, _POOL = _POOL, None
+    if pool is not None:
+        pool.shutdown(cancel_futures=True)
+
+
+def _kill_pool(pool: ProcessPoolExecutor):
+    """
+    A worker stuck on a malformed document cannot be cancelled, so the whole
+    pool is torn down and the next request starts a fresh one.
+    """
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is pool:
+            _POOL = None
+    for proc in list((getattr(pool, "_processes", None) or {}).values()):
+        proc.terminate()
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _extract_pdf(pool: ProcessPoolExecutor, data: bytes, deadline: float) -> str:
+    first_stop = min(PAGES_PER_TASK, MAX_PAGES)
+    first = pool.submit(extract_pdf_pages, data, 0, first_stop)
+    done, _ = wait([first], timeout=max(0, deadline - time.monotonic()))
+    if not done:
+        raise TimeoutError
+    text, page_count = first.result()
+    last = min(page_count, MAX_PAGES)
+    if last <= first_stop:
+        return text
+    # Remaining page ranges in parallel
+    futures = [pool.submit(extract_pdf_pages, data, start, min(start + PAGES_PER_TASK, last))
+               for start in range(PAGES_PER_TASK, last, PAGES_PER_TASK)]
+    done, pending = wait(futures, timeout=max(0, deadline - time.monotonic()),
+                         return_when=FIRST_EXCEPTION)
+    for f in done:
+        if f.exception() is not None:
+            for p in pending:
+                p.cancel()
+            raise f.exception()
+    if pending:
+        raise TimeoutError
+    return "\n".join([text] + [f.result()[0] for f in futures])
+
+
+def _extract(pool: ProcessPoolExecutor, data: bytes, filename: str) -> str:
+    lower = filename.lower()
+    if not (lower.endswith(".pdf") or lower.endswith(".docx") or lower.endswith(".doc")):
+        raise ExtractionError("Unsupported file type")
+    deadline = time.monotonic() + EXTRACT_TIMEOUT
+    try:
+        if lower.endswith(".pdf"):
+            return _extract_pdf(pool, data, deadline)
+        future = pool.submit(extract_text_from_docx_bytes, data)
+        done, _ = wait([future], timeout=EXTRACT_TIMEOUT)
+        if not done:
+            raise TimeoutError
+        return future.result()
+    except TimeoutError:
+        _kill_pool(pool)
+        raise ExtractionTimeout(f"Extraction timed out after {EXTRACT_TIMEOUT:g}s")
+
+
+def extract_text(data: bytes, filename: str) -> str:
+    """
+    Text of an uploaded PDF/DOCX. Blocking; call from a worker thread.
+    Raises ExtractionError for unsupported, malformed or too-slow documents.
+    """
+    key = content_hash(data)
+    text = _TEXT_CACHE.get(key)
+    if text is not None:
+        return text
+    try:
+        pool = get_pool()
+        try:
+            text = _extract(pool, data, filename)
+        except BrokenProcessPool:
+            # Pool was torn down by another document's timeout; retry once on a fresh one
+            text = _extract(get_pool(), data, filename)
+        except RuntimeError as e:
+            # Parser errors (e.g. PyMuPDF's FileDataError) are RuntimeErrors too: only
+            # "cannot schedule new futures after shutdown" from a replaced pool is retried
+            if pool is _POOL or "after shutdown" not in str(e):
+                raise
+            text = _extract(get_pool(), data, filename)
+    except ExtractionError:
+        raise
+    except Exception as e:
+        raise ExtractionError(f"Could not parse {filename or 'file'}: {e}") from e
+    _TEXT_CACHE.put(key, text)
+    return text
+
+
+def cache_stats() -> dict:
+    return {"entries": len(_TEXT_CACHE), "chars": _TEXT_CACHE.size,
+            "hits": _TEXT_CACHE.hits, "misses": _TEXT_CACHE.misses}
@@ -0,0 +1,190 @@
+# backend/app/jd_store.py
+import hashlib
+import json
+import os
+import pickle
+import threading
+from typing import List, NamedTuple, Optional
+
+from scipy.sparse import csr_matrix
+from sqlalchemy.orm import Session
+
+from .cache import LRUCache
+from .matching import SkillMatcher, tokenize
+from .models import JobDescription
+from .semantic import vectorize_tokens
+
+# Bound on the total number of skills held in memory across cached JDs
+JD_CACHE_MAX_SKILLS = int(os.environ.get("JD_CACHE_MAX_SKILLS", "50000"))
+
+# Startup snapshot: cached JD entries (skills, compiled matcher, vector) pickled to one
+# file at shutdown and loaded at startup, so a cold process doesn't rebuild them per JD.
+# Only ever read back from a path this service wrote; set to "" to disable.
+JD_SNAPSHOT_PATH = os.environ.get("JD_SNAPSHOT_PATH", "jd_snapshot.pkl")
+SNAPSHOT_VERSION = 1
+
+
+class JDEntry(NamedTuple):
+    id: int
+    title: str
+    skills: List[str]
+    matcher: SkillMatcher
+    skills_hash: str  # changes whenever the skill list does
+    vector: csr_matrix  # semantic vector of the full JD text
+
+
+_CACHE = LRUCache(JD_CACHE_MAX_SKILLS, sizeof=lambda entry: max(1, len(entry.skills)))
+
+
+def skills_digest(skills_json: Optional[str]) -> str:
+    return hashlib.sha256((skills_json or "[]").encode()).hexdigest()
+
+
+def _entry_from_row(row: JobDescription) -> JDEntry:
+    skills_json = row.skills_json or "[]"
+    skills = json.loads(skills_json)
+    skills_hash = skills_digest(skills_json)
+    vector = vectorize_tokens([tokenize(row.raw_text or "")])
+    return JDEntry(row.id, row.title, skills, SkillMatcher(skills), skills_hash, vector)
+
+
+def create_jd(db: Session, title: str, raw_text: str, skills: List[str]) -> JDEntry:
+    """Persist a JD with its extracted skills; they are never re-extracted afterwards"""
+    row = JobDescription(title=title, raw_text=raw_text, skills_json=json.dumps(skills))
+    db.add(row)
+    db.commit()
+    db.refresh(row)
+    entry = _entry_from_row(row)
+    _CACHE.put(row.id, entry)
+    return entry
+
+
+def get_jd(db: Session, jd_id: int) -> Optional[JDEntry]:
+    """Cached JD entry, loaded from the database on a miss (e.g. created by another worker)"""
+    _apply_updates()
+    entry = _CACHE.get(jd_id)
+    if entry is None:
+        row = db.get(JobDescription, jd_id)
+        if row is None:
+            return None
+        entry = _entry_from_row(row)
+        _CACHE.put(jd_id, entry)
+    return entry
+
+
+# ----------------------------
+# Invalidation across workers
+# ----------------------------
+# JDs are immutable except for skill edits (see rescoring.py). An edit appends the JD id
+# to this log; every worker checks its size on lookup (one stat call) and drops the listed
+# JDs from its own cache. Like the talent pool, this assumes workers share a filesystem.
+JD_UPDATES_LOG = os.environ.get("JD_UPDATES_LOG", "jd_updates.log")
+
+
+def _log_size() -> int:
+    try:
+        return os.stat(JD_UPDATES_LOG).st_size
+    except OSError:
+        return 0
+
+
+_log_applied = _log_size()  # bytes of the log already applied; earlier edits are already in the database
+
+
+_log_lock = threading.Lock()
+
+
+def _apply_updates():
+    global _log_applied
+    size = _log_size()
+    if size <= _log_applied:
+        return
+    with _log_lock:
+        if size <= _log_applied:
+            return
+        with open(JD_UPDATES_LOG, "rb") as f:
+            f.seek(_log_applied)
+            data = f.read(size - _log_applied)
+        complete = data[:data.rfind(b"\n") + 1]  # a line still being written is applied next time
+        for line in complete.split():
+            _CACHE.pop(int(line))
+        _log_applied += len(complete)
+
+
+def invalidate(jd_id: int):
+    """Drop a JD from every worker's cache after its row changed"""
+    _CACHE.pop(jd_id)
+    with open(JD_UPDATES_LOG, "ab") as f:
+        f.write(f"{jd_id}\n".encode())  # one small O_APPEND write: lines never interleave
+
+
+def cache_stats() -> dict:
+    return {"entries": len(_CACHE), "skills": _CACHE.size, "hits": _CACHE.hits, "misses": _CACHE.misses}
+
+
+# ----------------------------
+# Startup snapshot
+# ----------------------------
+def save_snapshot(entries: List[JDEntry] = None, path: str = None) -> int:
+    """Write entries (default: the cache, least recently used first); returns how many were written"""
+    path = JD_SNAPSHOT_PATH if path is None else path
+    if not path:
+        return 0
+    entries = _CACHE.values() if entries is None else entries
+    tmp = f"{path}.{os.getpid()}.tmp"  # several workers may save at once; the last rename wins
+    with open(tmp, "wb") as f:
+        pickle.dump({"version": SNAPSHOT_VERSION, "entries": entries}, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+    return len(entries)
+
+
+def build_snapshot(db: Session, path: str = None) -> int:
+    """Snapshot the most recent persisted JDs, as many as fit in the cache"""
+    entries, total = [], 0
+    for row in db.query(JobDescription).order_by(JobDescription.id.desc()).yield_per(200):
+        entry = _entry_from_row(row)
+        total += _CACHE.sizeof(entry)
+        if total > JD_CACHE_MAX_SKILLS:
+            break
+        entries.append(entry)
+    return save_snapshot(entries[::-1], path)
+
+
+def load_snapshot(db: Session, path: str = None) -> int:
+    """
+    Fill the cache from a snapshot. Entries whose JD no longer exists or whose
+    skills changed (e.g. the database was replaced) are dropped. Returns entries loaded.
+    """
+    path = JD_SNAPSHOT_PATH if path is None else path
+    if not path or not os.path.exists(path):
+        return 0
+    try:
+        with open(path, "rb") as f:
+            snapshot = pickle.load(f)
+    except Exception:  # truncated or written by an incompatible version: rebuild lazily instead
+        return 0
+    if not isinstance(snapshot, dict) or snapshot.get("version") != SNAPSHOT_VERSION:
+        return 0
+    entries = snapshot["entries"]
+    current = {}
+    ids = [entry.id for entry in entries]
+    for start in range(0, len(ids), 500):
+        rows = db.query(JobDescription.id, JobDescription.skills_json).filter(
+            JobDescription.id.in_(ids[start:start + 500]))
+        current.update((jd_id, skills_digest(skills_json)) for jd_id, skills_json in rows)
+    loaded = 0
+    for entry in entries:
+        if current.get(entry.id) == entry.skills_hash:
+            _CACHE.put(entry.id, entry)
+            loaded += 1
+    return loaded
+
+
+if __name__ == "__main__":
+    # Pre-build the snapshot, e.g. as a deploy step:  python -m app.jd_store
+    from . import jd_store  # the importable module, so entries don't pickle as __main__.JDEntry
+    from .db import SessionLocal, init_db
+
+    init_db()
+    with SessionLocal() as session:
+        print(f"{jd_store.build_snapshot(session)} JDs written to {JD_SNAPSHOT_PATH}")
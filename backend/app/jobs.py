@@ -0,0 +1,307 @@
+# backend/app/jobs.py
+# Bulk resume ingestion: ZIP archives are queued in the ingest_jobs table and
+# processed by a background thread in each API process; no external broker.
+import json
+import logging
+import os
+import shutil
+import threading
+import uuid
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, update
+from sqlalchemy.orm import Session
+
+from . import extraction, result_cache, talent_pool
+from .db import SessionLocal
+from .jd_store import get_jd
+from .models import Evaluation, IngestJob, Resume
+
+JOBS_DIR = os.environ.get("JOBS_DIR", os.path.join("uploaded_files", "jobs"))
+JOB_THREADS = int(os.environ.get("JOB_THREADS", str((os.cpu_count() or 1) * 2)))
+JOB_BATCH_SIZE = int(os.environ.get("JOB_BATCH_SIZE", "200"))  # rows per bulk insert
+MAX_ENTRY_BYTES = 20 * 1024 * 1024
+POLL_INTERVAL = 2.0  # seconds between queue polls when idle
+# A running job whose heartbeat is older than this is requeued (its process died mid-job)
+JOB_STALE_SECONDS = float(os.environ.get("JOB_STALE_SECONDS", "300"))
+HEARTBEAT_INTERVAL = JOB_STALE_SECONDS / 5
+SUPPORTED_EXTENSIONS = (".pdf", ".docx", ".doc")
+
+logger = logging.getLogger(__name__)
+
+_wakeup = threading.Event()
+_stop = threading.Event()
+_thread = None
+
+
+def create_job(db: Session, jd_id: int, fileobj) -> IngestJob:
+    """Queue a ZIP archive for processing. The archive is kept as-is; entries are never unpacked to disk"""
+    os.makedirs(JOBS_DIR, exist_ok=True)
+    path = os.path.join(JOBS_DIR, f"{uuid.uuid4().hex}.zip")
+    with open(path, "wb") as out:
+        shutil.copyfileobj(fileobj, out, 1 << 20)
+    if not zipfile.is_zipfile(path):
+        os.remove(path)
+        raise ValueError("Not a ZIP archive")
+    job = IngestJob(jd_id=jd_id, archive_path=path, status="queued")
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    _wakeup.set()
+    return job
+
+
+def job_status(job: IngestJob) -> dict:
+    end = job.finished_at or datetime.utcnow()
+    elapsed = (end - job.started_at).total_seconds() if job.started_at else 0.0
+    return {
+        "job_id": job.id,
+        "jd_id": job.jd_id,
+        "status": job.status,
+        "total": job.total,
+        "processed": job.processed,
+        "failed": job.failed,
+        "progress": round(job.processed / job.total, 4) if job.total else 0.0,
+        "elapsed_seconds": round(elapsed, 2),
+        "files_per_second": round(job.processed / elapsed, 2) if elapsed else 0.0,
+        "error": job.error,
+    }
+
+
+def job_results(db: Session, job_id: int, offset: int = 0, limit: int = 100) -> list:
+    rows = (
+        db.query(Evaluation, Resume.filename)
+        .join(Resume, Resume.id == Evaluation.resume_id)
+        .filter(Evaluation.job_id == job_id)
+        .order_by(Evaluation.id)
+        .offset(offset)
+        .limit(limit)
+        .all()
+    )
+    return [
+        {
+            "resume_id": ev.resume_id,
+            "filename": filename,
+            "score": int(ev.score),
+            "verdict": ev.verdict,
+            "matched_skills": json.loads(ev.matched_skills or "[]"),
+            "missing_skills": json.loads(ev.missing_skills or "[]"),
+            "semantic_score": ev.semantic_score,
+            "final_score": ev.final_score,
+        }
+        for ev, filename in rows
+    ]
+
+
+# ----------------------------
+# Worker
+# ----------------------------
+def _claim_next(db: Session):
+    """Atomically move the oldest queued job to running; safe across uvicorn workers"""
+    while True:
+        candidate = (
+            db.query(IngestJob.id)
+            .filter(IngestJob.status == "queued")
+            .order_by(IngestJob.id)
+            .first()
+        )
+        if candidate is None:
+            return None
+        now = datetime.utcnow()
+        claimed = db.execute(
+            update(IngestJob)
+            .where(IngestJob.id == candidate.id, IngestJob.status == "queued")
+            .values(status="running", started_at=func.coalesce(IngestJob.started_at, now), heartbeat_at=now)
+        ).rowcount
+        db.commit()
+        if claimed:
+            return candidate.id
+
+
+def requeue_stale_jobs(db: Session) -> int:
+    """Put running jobs whose worker stopped heartbeating (restart, crash, scale-to-zero) back in the queue"""
+    cutoff = datetime.utcnow() - timedelta(seconds=JOB_STALE_SECONDS)
+    requeued = db.execute(
+        update(IngestJob)
+        .where(IngestJob.status == "running",
+               func.coalesce(IngestJob.heartbeat_at, IngestJob.started_at) < cutoff)
+        .values(status="queued")
+    ).rowcount
+    db.commit()
+    if requeued:
+        logger.warning("requeued %d stale ingest job(s)", requeued)
+        _wakeup.set()
+    return requeued
+
+
+def _write_batch(db: Session, job: IngestJob, jd, batch, scoring_version: str):
+    """Bulk-insert one batch of Resume rows and their Evaluation rows"""
+    resumes = [
+        Resume(filename=filename, raw_text=text, content_hash=result_cache.resume_hash(text))
+        for filename, text, _ in batch
+    ]
+    db.add_all(resumes)
+    db.flush()
+    db.add_all([
+        Evaluation(
+            resume_id=resume.id,
+            jd_id=jd.id,
+            score=result["score"],
+            verdict=result["verdict"],
+            matched_skills=json.dumps(result["matched_skills"]),
+            missing_skills=json.dumps(result["missing_skills"]),
+            semantic_score=result["semantic_score"],
+            final_score=result["final_score"],
+            cache_key=result_cache.cache_key(resume.content_hash, jd.id, jd.skills_hash, scoring_version),
+            job_id=job.id,
+        )
+        for resume, (_, _, result) in zip(resumes, batch)
+    ])
+
+
+def _run_job(job_id: int, score, scoring_version: str):
+    db = SessionLocal()
+    job = db.get(IngestJob, job_id)
+    archive_path = job.archive_path
+    try:
+        jd = get_jd(db, job.jd_id)
+        if jd is None:
+            raise ValueError("JD not found")
+
+        # A requeued job resumes: entries already written by the earlier attempt are skipped
+        done_names = {name for (name,) in db.query(Resume.filename)
+                      .join(Evaluation, Evaluation.resume_id == Resume.id)
+                      .filter(Evaluation.job_id == job.id)}
+        last_beat = time.monotonic()
+
+        def beat():
+            nonlocal last_beat
+            if time.monotonic() - last_beat >= HEARTBEAT_INTERVAL:
+                job.heartbeat_at = datetime.utcnow()
+                db.commit()
+                last_beat = time.monotonic()
+
+        def process(filename, data):
+            text = extraction.extract_text(data, filename)
+            return filename, text, score(text, jd)
+
+        with zipfile.ZipFile(archive_path) as archive, ThreadPoolExecutor(JOB_THREADS) as pool:
+            entries = [
+                info for info in archive.infolist()
+                if not info.is_dir()
+                and info.filename.lower().endswith(SUPPORTED_EXTENSIONS)
+                and not info.filename.startswith("__MACOSX/")
+            ]
+            job.total = len(entries)
+            job.heartbeat_at = datetime.utcnow()
+            db.commit()
+
+            batch, in_flight = [], set()
+            processed, failed = len(done_names), 0
+
+            def collect(done):
+                nonlocal processed, failed
+                for future in done:
+                    processed += 1
+                    try:
+                        batch.append(future.result())
+                    except Exception as e:
+                        failed += 1
+                        job.error = str(e)
+
+            def flush():
+                _write_batch(db, job, jd, batch, scoring_version)
+                job.processed, job.failed = processed, failed
+                job.heartbeat_at = datetime.utcnow()
+                db.commit()
+                batch.clear()
+
+            for info in entries:
+                if info.filename in done_names:
+                    continue
+                beat()
+                # Entries are read one at a time, straight from the archive into memory
+                if info.file_size > MAX_ENTRY_BYTES:
+                    processed += 1
+                    failed += 1
+                    job.error = f"{info.filename}: file too large"
+                    continue
+                with archive.open(info) as member:
+                    data = member.read()
+                in_flight.add(pool.submit(process, info.filename, data))
+                if len(in_flight) >= JOB_THREADS * 2:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    collect(done)
+                if len(batch) >= JOB_BATCH_SIZE:
+                    flush()
+            collect(wait(in_flight).done)
+            flush()
+        job.status = "done"
+    except Exception as e:
+        db.rollback()
+        job.status = "failed"
+        job.error = str(e)
+    finally:
+        job.finished_at = datetime.utcnow()
+        db.commit()
+        db.close()
+        if os.path.exists(archive_path):
+            os.remove(archive_path)
+
+
+def _worker_loop(score, scoring_version: str):
+    last_requeue = time.monotonic()
+    while not _stop.is_set():
+        db = SessionLocal()
+        try:
+            if time.monotonic() - last_requeue >= HEARTBEAT_INTERVAL:  # another worker may have died
+                requeue_stale_jobs(db)
+                last_requeue = time.monotonic()
+            job_id = _claim_next(db)
+        finally:
+            db.close()
+        if job_id is None:
+            _wakeup.wait(POLL_INTERVAL)
+            _wakeup.clear()
+            continue
+        _run_job(job_id, score, scoring_version)
+        # Add the new resumes to the talent pool now rather than on the next search
+        db = SessionLocal()
+        try:
+            talent_pool.POOL.sync(db)
+        except Exception:
+            logger.exception("talent pool sync failed")
+        finally:
+            db.close()
+
+
+def start_worker(score, scoring_version: str):
+    """
+    score(resume_text, jd_entry) -> result dict, as returned by compute_relevance.
+    Passed in by main to avoid a circular import.
+    """
+    global _thread
+    if _thread is None:
+        db = SessionLocal()
+        try:
+            requeue_stale_jobs(db)
+        except Exception:
+            logger.exception("requeueing stale ingest jobs failed")
+        finally:
+            db.close()
+        _stop.clear()
+        _thread = threading.Thread(target=_worker_loop, args=(score, scoring_version),
+                                   name="ingest-worker", daemon=True)
+        _thread.start()
+
+
+def stop_worker():
+    global _thread
+    _stop.set()
+    _wakeup.set()
+    if _thread is not None:
+        _thread.join(timeout=5)
+        _thread = None
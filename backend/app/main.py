@@ -1,13 +1,107 @@
-from fastapi import FastAPI
+from . import startup  # first, so it times the imports below
+from fastapi import Depends, FastAPI, File, Form, Request, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import List
-import uuid
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+import asyncio
+import json
+import logging
+import os
 import re
+import time
 
-app = FastAPI()
+from . import evaluations, extraction, jd_store, jobs, metrics, rescoring, result_cache, semantic, talent_pool
+from .db import SessionLocal, get_db, init_db
+from .jd_store import create_jd, get_jd
+from .matching import SkillMatcher, tokenize
+from .models import IngestJob
+from .scoring import compute_final_score, relevance_verdict
 
-# In-memory JD storage
-JDS = {}
+startup.imports_done()  # stop timing imports even if the lifespan never runs (e.g. benchmarks, tests)
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever compute_relevance's output can change; invalidates cached results
+SCORING_VERSION = "3"
+
+# Process pool for /evaluate_batch, created on first use
+POOL_WORKERS = os.cpu_count() or 1
+_POOL = None
+
+def get_pool() -> ProcessPoolExecutor:
+    global _POOL
+    if _POOL is None:
+        _POOL = ProcessPoolExecutor(max_workers=POOL_WORKERS)
+    return _POOL
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    startup.phase("import", startup.STARTED)
+    started = time.perf_counter()
+    init_db()
+    startup.phase("init_db", started)
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        loaded = jd_store.load_snapshot(db)
+    startup.phase(f"jd_snapshot_load[{loaded}]", started)
+    started = time.perf_counter()
+    metrics.start_profiler()
+    jobs.start_worker(lambda resume_text, jd: compute_relevance("", resume_text, jd.matcher, jd_vector=jd.vector),
+                      SCORING_VERSION)
+    startup.phase("workers", started)
+    startup.finish()
+    yield
+    jobs.stop_worker()
+    if _POOL is not None:
+        _POOL.shutdown(cancel_futures=True)
+    extraction.shutdown()
+    try:
+        jd_store.save_snapshot()
+    except OSError:
+        logger.exception("Could not write the JD snapshot")
+
+app = FastAPI(lifespan=lifespan)
+
+@app.middleware("http")
+async def timing_middleware(request: Request, call_next):
+    """Per-request latency histogram, in-flight gauge and Server-Timing header"""
+    timing, token = metrics.begin_request(request.url.path)
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+    finally:
+        route = request.scope.get("route")
+        timing.endpoint = getattr(route, "path", "unmatched")  # template, e.g. /jobs/{job_id}
+        total = metrics.end_request(timing, token, request.method, status)
+        startup.first_response()
+    response.headers["Server-Timing"] = metrics.server_timing(timing, total)
+    return response
+
+metrics.register(metrics.Gauge("resume_jd_cache_entries", "JDs held in the in-memory JD cache",
+                               callback=lambda: jd_store.cache_stats()["entries"]))
+metrics.register(metrics.Gauge("resume_jd_cache_skills", "Skills held in the in-memory JD cache",
+                               callback=lambda: jd_store.cache_stats()["skills"]))
+metrics.register(metrics.Gauge("resume_jd_cache_hits_total", "JD cache hits", kind="counter",
+                               callback=lambda: jd_store.cache_stats()["hits"]))
+metrics.register(metrics.Gauge("resume_jd_cache_misses_total", "JD cache misses", kind="counter",
+                               callback=lambda: jd_store.cache_stats()["misses"]))
+metrics.register(metrics.Gauge("resume_result_cache_hit_ratio", "Evaluation result cache hit ratio",
+                               callback=lambda: result_cache.stats()["hit_rate"]))
+metrics.register(metrics.Gauge("resume_result_cache_memory_hits_total", "Result cache in-memory hits",
+                               kind="counter", callback=lambda: result_cache.stats()["memory_hits"]))
+metrics.register(metrics.Gauge("resume_result_cache_db_hits_total", "Result cache database hits",
+                               kind="counter", callback=lambda: result_cache.stats()["db_hits"]))
+metrics.register(metrics.Gauge("resume_result_cache_misses_total", "Result cache misses",
+                               kind="counter", callback=lambda: result_cache.stats()["misses"]))
+metrics.register(metrics.Gauge("resume_text_cache_hits_total", "Extracted-text cache hits",
+                               kind="counter", callback=lambda: extraction.cache_stats()["hits"]))
+metrics.register(metrics.Gauge("resume_text_cache_misses_total", "Extracted-text cache misses",
+                               kind="counter", callback=lambda: extraction.cache_stats()["misses"]))
 
 # ----------------------------
 # Models
@@ -16,18 +110,27 @@ class JDInput(BaseModel):
     title: str
     jd: str
 
+class JDSkillsUpdate(BaseModel):
+    skills: List[str]
+    title: Optional[str] = None
+
 class ResumeInput(BaseModel):
-    jd_id: str
+    jd_id: int
     resume_text: str
 
 # ----------------------------
 # Helper functions
 # ----------------------------
+PUNCT_RE = re.compile(r"[^\w\s]")
+SPACES_RE = re.compile(r"\s+")
+BULLET_RE = re.compile(r"^[-*•]\s*")
+SKILL_SPLIT_RE = re.compile(r",|\band\b")
+
 def normalize(text: str) -> str:
     """Lowercase, remove punctuation, normalize spaces"""
     text = text.lower()
-    text = re.sub(r"[^\w\s]", " ", text)
-    text = re.sub(r"\s+", " ", text)
+    text = PUNCT_RE.sub(" ", text)
+    text = SPACES_RE.sub(" ", text)
     return text.strip()
 
 def extract_skills_from_jd(jd_text: str) -> List[str]:
@@ -42,62 +145,296 @@ def extract_skills_from_jd(jd_text: str) -> List[str]:
         line = line.strip()
         if not line:
             continue
-        line = re.sub(r"^[-*•]\s*", "", line)  # remove bullets
+        line = BULLET_RE.sub("", line)  # remove bullets
         if ':' in line:
             line = line.split(":", 1)[1].strip()  # text after colon
         # Split by comma or 'and'
-        line_skills = [s.strip() for s in re.split(r",|\band\b", line) if s.strip()]
+        line_skills = [s.strip() for s in SKILL_SPLIT_RE.split(line) if s.strip()]
         skills.extend(line_skills)
     return list(set(skills))  # remove duplicates
 
 def extract_skills_from_resume(resume_text: str, jd_skills: List[str]) -> List[str]:
     """
-    Match only JD-listed skills in resume text
+    Match only JD-listed skills in resume text (whole-token matches)
+    """
+    return SkillMatcher(jd_skills).match(resume_text)
+
+def compute_relevance(jd_text: str, resume_text: str, matcher: SkillMatcher = None, tokens: List[str] = None,
+                      jd_vector=None, similarity: float = None):
+    """
+    matcher / jd_vector: precomputed from the JD, otherwise built from jd_text.
+    tokens: tokenize(resume_text), if the caller already has it.
+    similarity: semantic similarity, if the caller scored a whole batch at once.
     """
-    resume_clean = normalize(resume_text)
-    matched = []
-    for skill in jd_skills:
-        skill_clean = normalize(skill)
-        if skill_clean in resume_clean:  # substring match
-            matched.append(skill)
-    return matched
-
-def compute_relevance(jd_text: str, resume_text: str):
-    jd_skills = extract_skills_from_jd(jd_text)
-    matched_skills = extract_skills_from_resume(resume_text, jd_skills)
+    if matcher is None:
+        matcher = SkillMatcher(extract_skills_from_jd(jd_text))
+    if tokens is None:
+        tokens = tokenize(resume_text)
+    if similarity is None:
+        if jd_vector is None and jd_text:
+            jd_vector = semantic.vectorize_tokens([tokenize(jd_text)])
+        similarity = 0.0
+        if jd_vector is not None:
+            similarity = float(semantic.similarities(semantic.vectorize_tokens([tokens]), jd_vector)[0])
+    jd_skills = matcher.skills
+    matched_skills = matcher.match_tokens(tokens)
     missing_skills = list(set(jd_skills) - set(matched_skills))
     score = int(len(matched_skills) / len(jd_skills) * 100) if jd_skills else 0
 
-    # 4-level verdict
-    if score >= 90:
-        verdict = "Excellent"
-    elif score >= 80:
-        verdict = "Very Good"
-    elif score >= 70:
-        verdict = "Good"
-    else:
-        verdict = "Bad"
-
     return {
         "score": score,
-        "verdict": verdict,
+        "verdict": relevance_verdict(score),
         "matched_skills": matched_skills,
-        "missing_skills": missing_skills
+        "missing_skills": missing_skills,
+        "semantic_score": round(100 * similarity, 2),
+        "final_score": compute_final_score(len(matched_skills) / len(jd_skills) if jd_skills else 0.0, similarity),
     }
 
+def score_batch_chunk(matcher: SkillMatcher, jd_vector, items):
+    """
+    Process-pool worker for /evaluate_batch.
+    items: (index, resume_text) pairs.
+    """
+    token_lists = [tokenize(resume_text) for _, resume_text in items]
+    # Semantic similarity for the whole chunk in one sparse product
+    sims = semantic.similarities(semantic.vectorize_tokens(token_lists), jd_vector)
+    results = []
+    for (index, resume_text), tokens, sim in zip(items, token_lists, sims):
+        try:
+            result = compute_relevance("", resume_text, matcher, tokens, similarity=float(sim))
+            results.append({"index": index, **result})
+        except Exception as e:
+            results.append({"index": index, "error": str(e)})
+    return results
+
+def chunk_items(items, n_workers: int):
+    """Small chunks so results stream early, but not one IPC round-trip per resume"""
+    size = max(1, min(16, len(items) // (n_workers * 4)))
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
 # ----------------------------
 # Endpoints
 # ----------------------------
 @app.post("/jd")
-def upload_jd(jd_input: JDInput):
-    jd_id = str(uuid.uuid4())
-    JDS[jd_id] = jd_input.jd
-    return {"jd_id": jd_id}
+def upload_jd(jd_input: JDInput, db: Session = Depends(get_db)):
+    metrics.mark_since_start("parse")
+    with metrics.stage("jd_skill_extraction"):
+        skills = extract_skills_from_jd(jd_input.jd)
+    with metrics.stage("store"):
+        entry = create_jd(db, jd_input.title, jd_input.jd, skills)
+    talent_pool.POOL.request_backfill(skills)
+    with metrics.stage("serialize"):
+        return JSONResponse({"jd_id": entry.id})
+
+@app.put("/jd/{jd_id}")
+def update_jd(jd_id: int, update: JDSkillsUpdate, db: Session = Depends(get_db)):
+    """
+    Replace a JD's skill list. Stored evaluations are re-scored incrementally:
+    only added skills are matched against resume text.
+    """
+    metrics.mark_since_start("parse")
+    with metrics.stage("rescore"):
+        summary = rescoring.update_jd_skills(db, jd_id, update.skills, SCORING_VERSION, update.title)
+    if summary is None:
+        return {"error": "JD not found"}
+    talent_pool.POOL.request_backfill(summary["added"])
+    return summary
 
 @app.post("/evaluate_resume")
-def evaluate_resume(resume_input: ResumeInput):
-    jd_text = JDS.get(resume_input.jd_id)
-    if not jd_text:
+def evaluate_resume(resume_input: ResumeInput, db: Session = Depends(get_db)):
+    metrics.mark_since_start("parse")
+    with metrics.stage("jd_lookup"):
+        jd = get_jd(db, resume_input.jd_id)
+    if jd is None:
         return {"error": "JD not found"}
-    result = compute_relevance(jd_text, resume_input.resume_text)
-    return result
+    with metrics.stage("normalize"):
+        tokens = tokenize(resume_input.resume_text)
+        resume_digest = result_cache.tokens_hash(tokens)
+    key = result_cache.cache_key(resume_digest, jd.id, jd.skills_hash, SCORING_VERSION)
+    with metrics.stage("cache_lookup"):
+        result = result_cache.get(db, key)
+    if result is None:
+        with metrics.stage("semantic"):
+            similarity = float(semantic.similarities(semantic.vectorize_tokens([tokens]), jd.vector)[0])
+        with metrics.stage("match"):
+            result = compute_relevance("", resume_input.resume_text, jd.matcher, tokens, similarity=similarity)
+        with metrics.stage("cache_store"):
+            result_cache.put(db, key, jd.id, resume_input.resume_text, resume_digest, result)
+    with metrics.stage("serialize"):
+        return JSONResponse(result)
+
+@app.get("/cache_stats")
+def cache_stats():
+    return result_cache.stats()
+
+@app.get("/metrics")
+def prometheus_metrics():
+    """Prometheus text format; per process, so scrape every worker"""
+    return PlainTextResponse(metrics.render_all(), media_type="text/plain; version=0.0.4")
+
+@app.get("/debug/slowest")
+def slowest_requests():
+    """Sampled stacks of the slowest requests (needs PROFILE_SLOWEST_N > 0)"""
+    return {"enabled": bool(metrics.PROFILE_SLOWEST_N), "requests": metrics.slowest_requests()}
+
+@app.get("/debug/startup")
+def startup_report():
+    """Cold-start timings of this worker: per-module imports, startup phases, first response"""
+    return startup.report()
+
+@app.post("/extract")
+def extract_resume(file: UploadFile = File(...)):
+    """Upload a PDF/DOCX and get its text back; nothing is written to disk"""
+    data = file.file.read()
+    try:
+        text = extraction.extract_text(data, file.filename or "")
+    except extraction.ExtractionError as e:
+        return {"error": str(e)}
+    return {"content_hash": extraction.content_hash(data), "resume_text": text}
+
+def batch_cache_lookup(jd, items):
+    """
+    Thread-pool step of /evaluate_batch: split (index, resume_text, filename) items into
+    cached results and the (index, resume_text, filename, digest, key) misses to score,
+    one per distinct key. repeats: key -> indices of later items with the same key.
+    """
+    with metrics.stage("normalize"):
+        keyed = []
+        for index, resume_text, filename in items:
+            digest = result_cache.tokens_hash(tokenize(resume_text))
+            keyed.append((index, resume_text, filename, digest,
+                          result_cache.cache_key(digest, jd.id, jd.skills_hash, SCORING_VERSION)))
+    with metrics.stage("cache_lookup"), SessionLocal() as db:
+        cached = result_cache.get_many(db, [item[4] for item in keyed])
+    hits, misses, repeats = [], {}, {}
+    for item in keyed:
+        index, key = item[0], item[4]
+        if key in cached:
+            hits.append({"index": index, **cached[key]})
+        elif key in misses:
+            repeats.setdefault(key, []).append(index)
+        else:
+            misses[key] = item
+    return hits, list(misses.values()), repeats
+
+def batch_cache_store(jd_id: int, misses, results):
+    """Thread-pool step of /evaluate_batch: store freshly scored results, as /evaluate_resume does"""
+    scored = {r["index"]: r for r in results if "error" not in r}
+    entries = [(key, resume_text, digest, {k: v for k, v in scored[index].items() if k != "index"}, filename)
+               for index, resume_text, filename, digest, key in misses if index in scored]
+    with metrics.stage("cache_store"), SessionLocal() as db:
+        result_cache.put_many(db, jd_id, entries)
+
+@app.post("/evaluate_batch")
+async def evaluate_batch(
+    jd_id: int = Form(...),
+    resume_texts: List[str] = Form(default=[]),
+    filenames: List[str] = Form(default=[]),
+    files: List[UploadFile] = File(default=[]),
+    db: Session = Depends(get_db),
+):
+    """
+    Score many resumes against one JD. Results are streamed back as NDJSON
+    in completion order; each line carries the input "index" (texts first, then files).
+    Goes through the result cache and stores what it scores, like /evaluate_resume;
+    filenames (optional, one per text) name newly stored resumes.
+    """
+    jd = await run_in_threadpool(get_jd, db, jd_id)  # a cache miss queries and vectorizes: keep it off the event loop
+    if jd is None:
+        return {"error": "JD not found"}
+    matcher, jd_vector = jd.matcher, jd.vector
+    uploads = [(len(resume_texts) + i, f.filename or "", await f.read()) for i, f in enumerate(files)]
+    texts = [(i, text, filenames[i] if i < len(filenames) else None) for i, text in enumerate(resume_texts)]
+    hits, misses, repeats = await run_in_threadpool(batch_cache_lookup, jd, texts)  # one bulk lookup
+    pool = get_pool()
+
+    async def score_misses(misses, repeats):
+        loop = asyncio.get_running_loop()
+        results = await loop.run_in_executor(pool, score_batch_chunk, matcher, jd_vector,
+                                             [(index, resume_text) for index, resume_text, *_ in misses])
+        await run_in_threadpool(batch_cache_store, jd.id, misses, results)
+        keys = {item[0]: item[4] for item in misses}
+        return results + [{**r, "index": i} for r in results for i in repeats.get(keys[r["index"]], ())]
+
+    async def score_upload(index, filename, data):
+        loop = asyncio.get_running_loop()
+        try:
+            text = await loop.run_in_executor(None, extraction.extract_text, data, filename)
+        except extraction.ExtractionError as e:
+            return [{"index": index, "error": str(e)}]
+        upload_hits, upload_misses, _ = await run_in_threadpool(batch_cache_lookup, jd, [(index, text, filename)])
+        return upload_hits or await score_misses(upload_misses, {})
+
+    async def stream():
+        futures = [score_misses(chunk, repeats) for chunk in chunk_items(misses, POOL_WORKERS)]
+        futures += [score_upload(*upload) for upload in uploads]
+        for result in hits:
+            yield json.dumps(result) + "\n"
+        for future in asyncio.as_completed(futures):
+            for result in await future:
+                yield json.dumps(result) + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+@app.get("/jd/{jd_id}/top_candidates")
+def top_candidates(jd_id: int, k: int = 10, db: Session = Depends(get_db)):
+    """Rank every stored resume against a JD using the talent-pool skill matrix"""
+    jd = get_jd(db, jd_id)
+    if jd is None:
+        return {"error": "JD not found"}
+    return {"jd_id": jd_id, **talent_pool.POOL.top_candidates(db, jd.skills, min(k, 1000))}
+
+@app.get("/jd/{jd_id}/leaderboard")
+def jd_leaderboard(jd_id: int, limit: int = 10, offset: int = 0, verdict: Optional[str] = None,
+                   order_by: str = "score", db: Session = Depends(get_db)):
+    """Top-N stored evaluations of a JD, optionally for one verdict (e.g. verdict=very good)"""
+    if get_jd(db, jd_id) is None:
+        return {"error": "JD not found"}
+    if order_by not in evaluations.LEADERBOARD_ORDER:
+        return {"error": f"order_by must be one of {', '.join(evaluations.LEADERBOARD_ORDER)}"}
+    verdict = verdict.strip().title() if verdict else None
+    offset = max(0, offset)
+    return {"jd_id": jd_id, "verdict": verdict, "order_by": order_by, "offset": offset,
+            "results": evaluations.leaderboard(db, jd_id, verdict, order_by, max(1, min(limit, 1000)), offset)}
+
+@app.get("/evaluations")
+def evaluation_history(jd_id: Optional[int] = None, verdict: Optional[str] = None, before_id: Optional[int] = None,
+                       limit: int = 100, db: Session = Depends(get_db)):
+    """Evaluation history, newest first; page with before_id=<next_before_id of the previous page>"""
+    verdict = verdict.strip().title() if verdict else None
+    return evaluations.history(db, jd_id, verdict, before_id, max(1, min(limit, 1000)))
+
+@app.get("/evaluations/export.csv")
+def export_evaluations(jd_id: Optional[int] = None, verdict: Optional[str] = None):
+    """All matching evaluations as CSV, streamed in chunks"""
+    verdict = verdict.strip().title() if verdict else None
+    filename = f"evaluations_jd{jd_id}.csv" if jd_id is not None else "evaluations.csv"
+    return StreamingResponse(evaluations.export_csv(jd_id, verdict), media_type="text/csv",
+                             headers={"Content-Disposition": f'attachment; filename="{filename}"'})
+
+@app.post("/jobs")
+def create_ingest_job(jd_id: int = Form(...), file: UploadFile = File(...), db: Session = Depends(get_db)):
+    """Queue a ZIP of PDF/DOCX resumes to be parsed and scored in the background"""
+    if get_jd(db, jd_id) is None:
+        return {"error": "JD not found"}
+    try:
+        job = jobs.create_job(db, jd_id, file.file)
+    except ValueError as e:
+        return {"error": str(e)}
+    return jobs.job_status(job)
+
+@app.get("/jobs/{job_id}")
+def ingest_job_status(job_id: int, db: Session = Depends(get_db)):
+    job = db.get(IngestJob, job_id)
+    if job is None:
+        return {"error": "Job not found"}
+    return jobs.job_status(job)
+
+@app.get("/jobs/{job_id}/results")
+def ingest_job_results(job_id: int, offset: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+    """Results written so far, in processing order"""
+    if db.get(IngestJob, job_id) is None:
+        return {"error": "Job not found"}
+    offset = max(0, offset)  # negative LIMIT/OFFSET mean "no limit" to SQLite
+    return {"job_id": job_id, "offset": offset,
+            "results": jobs.job_results(db, job_id, offset, max(1, min(limit, 1000)))}
@@ -0,0 +1,60 @@
+# backend/app/matching.py
+import re
+from typing import Dict, List
+
+# Same token definition as main.normalize(): lowercase words, punctuation dropped
+TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens, equivalent to normalize(text).split()"""
+    return TOKEN_RE.findall(text.lower())
+
+
+class SkillMatcher:
+    """
+    Token trie over a JD's skill list.
+
+    Built once per JD; scoring a resume is a single pass over its tokens, and
+    skills only match on whole tokens ("java" does not match "javascript").
+    """
+
+    def __init__(self, skills: List[str]):
+        self.skills = list(skills)
+        self.root: Dict = {}
+        for idx, skill in enumerate(self.skills):
+            tokens = tokenize(skill)
+            if not tokens:
+                continue
+            node = self.root
+            for tok in tokens:
+                node = node.setdefault(tok, {})
+            node.setdefault(None, []).append(idx)  # None key marks end of a skill
+
+    def match_indices(self, text: str) -> set:
+        return self.match_token_indices(tokenize(text))
+
+    def match_token_indices(self, tokens: List[str]) -> set:
+        root = self.root
+        found = set()
+        n = len(tokens)
+        for i in range(n):
+            node = root.get(tokens[i])
+            j = i + 1
+            while node is not None:
+                ends = node.get(None)
+                if ends:
+                    found.update(ends)
+                if j >= n:
+                    break
+                node = node.get(tokens[j])
+                j += 1
+        return found
+
+    def match(self, text: str) -> List[str]:
+        """JD skills found in text, in JD order"""
+        return self.match_tokens(tokenize(text))
+
+    def match_tokens(self, tokens: List[str]) -> List[str]:
+        """Same as match(), for an already tokenized text"""
+        return [self.skills[i] for i in sorted(self.match_token_indices(tokens))]
@@ -0,0 +1,251 @@
+# backend/app/metrics.py
+# Per-stage latency metrics in Prometheus text format, Server-Timing data for
+# each request, and an opt-in sampling profiler for the slowest requests.
+# Metrics are per process: under `uvicorn --workers N` each worker reports its own.
+import heapq
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Opt-in profiler: keep sampled stacks of the N slowest requests
+PROFILE_SLOWEST_N = int(os.environ.get("PROFILE_SLOWEST_N", "0"))
+PROFILE_INTERVAL = float(os.environ.get("PROFILE_INTERVAL", "0.005"))  # seconds between samples
+
+
+def _format_labels(names, values, extra=""):
+    parts = [f'{n}="{v}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Histogram:
+    def __init__(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self._series = {}  # label values -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._series.items())
+        for label_values, series in items:
+            for bound, count in zip(self.buckets, series):
+                labels = _format_labels(self.labels, label_values, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{labels} {count}")
+            labels = _format_labels(self.labels, label_values, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{labels} {series[-1]}")
+            labels = _format_labels(self.labels, label_values)
+            lines.append(f"{self.name}_sum{labels} {series[-2]}")
+            lines.append(f"{self.name}_count{labels} {series[-1]}")
+        return lines
+
+
+class Gauge:
+    """Value read at scrape time from a callback, or set/inc/dec directly"""
+
+    def __init__(self, name, help_text, kind="gauge", callback=None):
+        self.name = name
+        self.help = help_text
+        self.kind = kind
+        self.callback = callback
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount=1):
+        self.inc(-amount)
+
+    def render(self):
+        value = self.callback() if self.callback else self.value
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}", f"{self.name} {value}"]
+
+
+REGISTRY = []
+
+
+def register(metric):
+    REGISTRY.append(metric)
+    return metric
+
+
+def render_all() -> str:
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+STAGE_SECONDS = register(Histogram(
+    "resume_stage_seconds", "Time spent in each processing stage", labels=("endpoint", "stage")))
+REQUEST_SECONDS = register(Histogram(
+    "resume_request_seconds", "Total request latency", labels=("endpoint", "method", "status")))
+IN_FLIGHT = register(Gauge("resume_requests_in_flight", "Requests currently being handled"))
+
+
+# ----------------------------
+# Per-request timing
+# ----------------------------
+class RequestTiming:
+    def __init__(self, endpoint):
+        self.endpoint = endpoint
+        self.start = time.perf_counter()
+        self.stages = []  # (name, seconds)
+        self.threads = set()  # thread idents to sample when profiling
+        self.samples = Counter()
+        self.finished = False  # set by end_request; stages are observed directly from then on
+
+
+_current = ContextVar("request_timing", default=None)
+_active = {}  # id(RequestTiming) -> RequestTiming, for the profiler
+_active_lock = threading.Lock()
+_slowest = []  # min-heap of (duration, seq, report)
+_slowest_lock = threading.Lock()
+_seq = 0
+
+
+def _record(name, seconds):
+    timing = _current.get()
+    if timing is None:
+        STAGE_SECONDS.observe(seconds, "background", name)
+    elif timing.finished:  # e.g. a streaming body still producing after the response started
+        STAGE_SECONDS.observe(seconds, timing.endpoint, name)
+    else:
+        # observed in end_request, once timing.endpoint is the route template rather than the raw path
+        timing.stages.append((name, seconds))
+
+
+@contextmanager
+def stage(name):
+    """Time a block; recorded in the stage histogram and the current request's Server-Timing"""
+    timing = _current.get()
+    if timing is not None and PROFILE_SLOWEST_N:
+        timing.threads.add(threading.get_ident())
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _record(name, time.perf_counter() - start)
+
+
+def mark_since_start(name):
+    """Record the time from request start until now, e.g. body parsing and validation"""
+    timing = _current.get()
+    if timing is not None:
+        _record(name, time.perf_counter() - timing.start)
+
+
+def begin_request(endpoint):
+    timing = RequestTiming(endpoint)
+    token = _current.set(timing)
+    IN_FLIGHT.inc()
+    if PROFILE_SLOWEST_N:
+        with _active_lock:
+            _active[id(timing)] = timing
+    return timing, token
+
+
+def end_request(timing, token, method, status):
+    global _seq
+    _current.reset(token)
+    IN_FLIGHT.dec()
+    duration = time.perf_counter() - timing.start
+    timing.finished = True
+    for name, seconds in timing.stages:
+        STAGE_SECONDS.observe(seconds, timing.endpoint, name)
+    REQUEST_SECONDS.observe(duration, timing.endpoint, method, str(status))
+    if not PROFILE_SLOWEST_N:
+        return duration
+    with _active_lock:
+        _active.pop(id(timing), None)
+    report = {
+        "endpoint": timing.endpoint,
+        "duration_ms": round(duration * 1000, 3),
+        "stages": server_timing(timing),
+        "stacks": [{"samples": n, "stack": s} for s, n in timing.samples.most_common(20)],
+    }
+    with _slowest_lock:
+        _seq += 1
+        entry = (duration, _seq, report)
+        if len(_slowest) < PROFILE_SLOWEST_N:
+            heapq.heappush(_slowest, entry)
+        elif duration > _slowest[0][0]:
+            heapq.heapreplace(_slowest, entry)
+    return duration
+
+
+def server_timing(timing, total=None) -> str:
+    """Server-Timing header value; repeated stages are summed"""
+    totals = {}
+    for name, seconds in timing.stages:
+        totals[name] = totals.get(name, 0.0) + seconds
+    parts = [f"{name};dur={seconds * 1000:.3f}" for name, seconds in totals.items()]
+    if total is not None:
+        parts.append(f"total;dur={total * 1000:.3f}")
+    return ", ".join(parts)
+
+
+# ----------------------------
+# Sampling profiler
+# ----------------------------
+def _collapse(frame):
+    """Root-first "file:function:line" frames joined by ';' (flame graph collapsed format)"""
+    parts = []
+    while frame is not None:
+        code = frame.f_code
+        parts.append(f"{os.path.basename(code.co_filename)}:{code.co_name}:{frame.f_lineno}")
+        frame = frame.f_back
+    return ";".join(reversed(parts))
+
+
+def _sampler():
+    while True:
+        time.sleep(PROFILE_INTERVAL)
+        with _active_lock:
+            active = list(_active.values())
+        if not active:
+            continue
+        frames = sys._current_frames()
+        for timing in active:
+            for ident in list(timing.threads):
+                frame = frames.get(ident)
+                if frame is not None:
+                    timing.samples[_collapse(frame)] += 1
+
+
+def slowest_requests() -> list:
+    with _slowest_lock:
+        return [report for _, _, report in sorted(_slowest, reverse=True)]
+
+
+_profiler_started = False
+
+
+def start_profiler():
+    global _profiler_started
+    if PROFILE_SLOWEST_N and not _profiler_started:
+        _profiler_started = True
+        threading.Thread(target=_sampler, name="metrics-profiler", daemon=True).start()
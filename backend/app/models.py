@@ -1,5 +1,5 @@
 # backend/app/models.py
-from sqlalchemy import Column, Integer, String, Text, Float, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, Float, DateTime, ForeignKey, Index
 from sqlalchemy.types import JSON
 from datetime import datetime
 from .db import Base
@@ -17,14 +17,42 @@ class Resume(Base):
     id = Column(Integer, primary_key=True, index=True)
     filename = Column(String)
     raw_text = Column(Text)
+    content_hash = Column(String, index=True)  # sha256 of normalized text
     created_at = Column(DateTime, default=datetime.utcnow)
 
 class Evaluation(Base):
     __tablename__ = "evaluations"
     id = Column(Integer, primary_key=True, index=True)
-    resume_id = Column(Integer)
-    jd_id = Column(Integer)
+    resume_id = Column(Integer, index=True)
+    jd_id = Column(Integer, index=True)  # + the implicit rowid: per-JD history newest first
     score = Column(Float)
     verdict = Column(String)
-    missing_skills = Column(Text)  # JSON-like text
+    missing_skills = Column(Text)  # JSON-encoded list
+    matched_skills = Column(Text)  # JSON-encoded list
+    semantic_score = Column(Float)
+    final_score = Column(Float)
+    cache_key = Column(String, index=True)  # see result_cache.cache_key
+    job_id = Column(Integer, index=True)  # set for rows written by a bulk ingest job
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+    __table_args__ = (
+        # per-JD leaderboards: top-N by score, optionally for one verdict, straight off the index
+        Index("ix_evaluations_jd_score", "jd_id", "score"),
+        Index("ix_evaluations_jd_verdict_score", "jd_id", "verdict", "score"),
+        Index("ix_evaluations_jd_final_score", "jd_id", "final_score"),
+    )
+
+class IngestJob(Base):
+    __tablename__ = "ingest_jobs"
+    id = Column(Integer, primary_key=True, index=True)
+    jd_id = Column(Integer)
+    archive_path = Column(String)
+    status = Column(String, index=True, default="queued")  # queued/running/done/failed
+    total = Column(Integer, default=0)
+    processed = Column(Integer, default=0)
+    failed = Column(Integer, default=0)
+    error = Column(Text)  # last per-file error, or why the job failed
     created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+    heartbeat_at = Column(DateTime)  # refreshed while running; a stale one means the worker died
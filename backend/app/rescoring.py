@@ -0,0 +1,117 @@
+# backend/app/rescoring.py
+# Incremental re-scoring after a JD's skill list is edited. Whether a resume contains
+# a skill doesn't depend on the other skills, so each stored evaluation keeps its
+# matched/missing sets for unchanged skills, drops removed skills, and only the added
+# skills are matched against resume text. Removal-only edits never read a resume.
+import json
+from typing import List, Optional
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from . import jd_store, result_cache
+from .matching import SkillMatcher, tokenize
+from .models import Evaluation, JobDescription, Resume
+from .scoring import compute_final_score, relevance_verdict
+
+RESCORE_BATCH = 1000  # evaluations read and rewritten per round trip
+
+
+def _rescore_row(ev, skills, added_matcher, load_text):
+    """New result fields for one stored evaluation; load_text() is only called if a skill needs matching"""
+    was_matched = set(json.loads(ev.matched_skills or "[]"))
+    was_missing = set(json.loads(ev.missing_skills or "[]"))
+    unknown = [s for s in skills if s not in was_matched and s not in was_missing]
+    found = set()
+    if unknown:
+        tokens = tokenize(load_text() or "")
+        found = {added_matcher.skills[i] for i in added_matcher.match_token_indices(tokens)}
+        added = set(added_matcher.skills)
+        extra = [s for s in unknown if s not in added]  # rows written with an older skill list
+        if extra:
+            found.update(SkillMatcher(extra).match_tokens(tokens))
+    matched = [s for s in skills if s in was_matched or s in found]
+    missing = [s for s in skills if s not in was_matched and s not in found]
+    score = int(len(matched) / len(skills) * 100) if skills else 0
+    final_score = None
+    if ev.semantic_score is not None:  # the JD text didn't change, so neither did the similarity
+        final_score = compute_final_score(len(matched) / len(skills) if skills else 0.0, ev.semantic_score / 100)
+    return {
+        "score": score,
+        "verdict": relevance_verdict(score),
+        "matched_skills": json.dumps(matched),
+        "missing_skills": json.dumps(missing),
+        "final_score": final_score,
+    }
+
+
+def _rescore_evaluations(db: Session, jd_id: int, skills: List[str], added: List[str], skills_hash: str,
+                         scoring_version: str, after_id: int = 0):
+    """
+    Rewrite the JD's evaluations with id > after_id, committing every page so no write
+    transaction outlives one RESCORE_BATCH. Returns (rows rewritten, last id seen).
+    """
+    added_matcher = SkillMatcher(added)
+    columns = [Evaluation.id, Evaluation.matched_skills, Evaluation.missing_skills, Evaluation.semantic_score,
+               Evaluation.resume_id, Resume.content_hash]
+    if added:
+        columns.append(Resume.raw_text)  # every row needs matching; otherwise text is fetched per row if ever
+    rescored, last_id = 0, after_id
+    while True:
+        # keyset pages rather than one open cursor, since the same table is updated in between
+        batch = (db.query(*columns)
+                 .outerjoin(Resume, Resume.id == Evaluation.resume_id)
+                 .filter(Evaluation.jd_id == jd_id, Evaluation.id > last_id)
+                 .order_by(Evaluation.id)
+                 .limit(RESCORE_BATCH)
+                 .all())
+        if not batch:
+            return rescored, last_id
+        updates = []
+        for ev in batch:
+            if added:
+                load_text = lambda ev=ev: ev.raw_text
+            else:
+                load_text = lambda ev=ev: db.query(Resume.raw_text).filter(Resume.id == ev.resume_id).scalar()
+            fields = _rescore_row(ev, skills, added_matcher, load_text)
+            fields["id"] = ev.id
+            fields["cache_key"] = (result_cache.cache_key(ev.content_hash, jd_id, skills_hash, scoring_version)
+                                   if ev.content_hash and ev.semantic_score is not None else None)
+            updates.append(fields)
+        db.execute(update(Evaluation), updates)  # bulk UPDATE ... WHERE id = :id
+        db.commit()
+        rescored += len(batch)
+        last_id = batch[-1].id
+
+
+def update_jd_skills(db: Session, jd_id: int, skills: List[str], scoring_version: str,
+                     title: Optional[str] = None) -> Optional[dict]:
+    """
+    Replace a JD's skill list and rewrite its stored evaluations to match.
+    Evaluations are committed a page at a time and the JD row last, so an interrupted
+    edit leaves the JD on its old skills and repeating the edit finishes the rewrite
+    (rows already rewritten are left as they are). Returns None if the JD doesn't exist.
+    """
+    row = db.get(JobDescription, jd_id)
+    if row is None:
+        return None
+    old_skills = json.loads(row.skills_json or "[]")
+    skills = list(dict.fromkeys(s.strip() for s in skills if s.strip()))
+    old_set, new_set = set(old_skills), set(skills)
+    added = [s for s in skills if s not in old_set]
+    removed = [s for s in old_skills if s not in new_set]
+    skills_json = json.dumps(skills)
+    skills_hash = jd_store.skills_digest(skills_json)
+
+    rescored = last_id = 0
+    if skills != old_skills:  # a reorder changes result order and the cache keys too
+        rescored, last_id = _rescore_evaluations(db, jd_id, skills, added, skills_hash, scoring_version)
+    row = db.get(JobDescription, jd_id)  # expired by the page commits
+    if title:
+        row.title = title
+    row.skills_json = skills_json
+    db.commit()
+    jd_store.invalidate(jd_id)
+    if skills != old_skills:  # evaluations stored with the old skills while the JD row was unchanged
+        rescored += _rescore_evaluations(db, jd_id, skills, added, skills_hash, scoring_version, last_id)[0]
+    return {"jd_id": jd_id, "skills": skills, "added": added, "removed": removed, "rescored": rescored}
@@ -0,0 +1,133 @@
+# backend/app/result_cache.py
+import hashlib
+import json
+import os
+from threading import Lock
+from typing import List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from .cache import LRUCache
+from .matching import tokenize
+from .models import Evaluation, Resume
+
+RESULT_CACHE_SIZE = int(os.environ.get("RESULT_CACHE_SIZE", "10000"))  # entries
+LOOKUP_CHUNK = 500  # keys / content hashes per IN (...) query
+
+_MEMORY = LRUCache(RESULT_CACHE_SIZE)
+_STATS = {"memory_hits": 0, "db_hits": 0, "misses": 0}
+_STATS_LOCK = Lock()
+
+
+def _count(name: str, n: int = 1):
+    with _STATS_LOCK:
+        _STATS[name] += n
+
+
+def resume_hash(resume_text: str) -> str:
+    """Hash of the normalized text: case, punctuation and whitespace changes don't matter"""
+    return tokens_hash(tokenize(resume_text))
+
+
+def tokens_hash(tokens) -> str:
+    return hashlib.sha256(" ".join(tokens).encode()).hexdigest()
+
+
+def cache_key(resume_digest: str, jd_id: int, skills_hash: str, scoring_version: str) -> str:
+    """
+    Any change to the resume, the JD's skill list or the scoring logic gives a new key.
+    Keyed per JD too: JDs sharing a skill list still differ in text (semantic score), and
+    each JD needs its own Evaluation rows for its history, leaderboard and re-scoring.
+    """
+    return hashlib.sha256(f"{scoring_version}:{jd_id}:{skills_hash}:{resume_digest}".encode()).hexdigest()
+
+
+def _result_from_row(row: Evaluation) -> dict:
+    return {
+        "score": int(row.score),
+        "verdict": row.verdict,
+        "matched_skills": json.loads(row.matched_skills or "[]"),
+        "missing_skills": json.loads(row.missing_skills or "[]"),
+        "semantic_score": row.semantic_score,
+        "final_score": row.final_score,
+    }
+
+
+def get(db: Session, key: str):
+    return get_many(db, [key]).get(key)
+
+
+def get_many(db: Session, keys: List[str]) -> dict:
+    """key -> cached result for the keys that have one; one query per LOOKUP_CHUNK memory misses"""
+    found, pending = {}, []
+    for key in dict.fromkeys(keys):
+        result = _MEMORY.get(key)
+        if result is not None:
+            found[key] = dict(result)
+        else:
+            pending.append(key)
+    memory_hits = len(found)
+    for i in range(0, len(pending), LOOKUP_CHUNK):
+        rows = db.query(Evaluation).filter(Evaluation.cache_key.in_(pending[i:i + LOOKUP_CHUNK])).all()
+        for row in rows:
+            if row.cache_key not in found:
+                result = _result_from_row(row)
+                _MEMORY.put(row.cache_key, result)
+                found[row.cache_key] = dict(result)
+    _count("memory_hits", memory_hits)
+    _count("db_hits", len(found) - memory_hits)
+    _count("misses", len(pending) - (len(found) - memory_hits))
+    return found
+
+
+def put(db: Session, key: str, jd_id: int, resume_text: str, resume_digest: str, result: dict):
+    """Store in both tiers; the resume itself is stored once per distinct text"""
+    put_many(db, jd_id, [(key, resume_text, resume_digest, result, None)])
+
+
+def put_many(db: Session, jd_id: int, entries: List[Tuple[str, str, str, dict, Optional[str]]]):
+    """
+    put() for many results in one transaction.
+    entries: (key, resume_text, resume_digest, result, filename); filename is only
+    used for resumes not stored yet.
+    """
+    if not entries:
+        return
+    digests = list(dict.fromkeys(digest for _, _, digest, _, _ in entries))
+    resume_ids = {}
+    for i in range(0, len(digests), LOOKUP_CHUNK):
+        resume_ids.update((h, id_) for id_, h in db.query(Resume.id, Resume.content_hash)
+                          .filter(Resume.content_hash.in_(digests[i:i + LOOKUP_CHUNK])))
+    new_resumes = {}
+    for _, resume_text, digest, _, filename in entries:
+        if digest not in resume_ids and digest not in new_resumes:
+            new_resumes[digest] = Resume(filename=filename, raw_text=resume_text, content_hash=digest)
+    if new_resumes:
+        db.add_all(new_resumes.values())
+        db.flush()
+        resume_ids.update((digest, resume.id) for digest, resume in new_resumes.items())
+    results = {key: (digest, result) for key, _, digest, result, _ in entries}  # a key is stored once
+    db.add_all(Evaluation(
+        resume_id=resume_ids[digest],
+        jd_id=jd_id,
+        score=result["score"],
+        verdict=result["verdict"],
+        matched_skills=json.dumps(result["matched_skills"]),
+        missing_skills=json.dumps(result["missing_skills"]),
+        semantic_score=result["semantic_score"],
+        final_score=result["final_score"],
+        cache_key=key,
+    ) for key, (digest, result) in results.items())
+    db.commit()
+    for key, (_, result) in results.items():
+        _MEMORY.put(key, result)
+
+
+def stats() -> dict:
+    with _STATS_LOCK:
+        counts = dict(_STATS)
+    lookups = sum(counts.values())
+    hits = counts["memory_hits"] + counts["db_hits"]
+    counts["hit_rate"] = round(hits / lookups, 4) if lookups else 0.0
+    counts["memory_entries"] = len(_MEMORY)
+    return counts
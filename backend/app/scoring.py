@@ -1,40 +1,47 @@
 # backend/app/scoring.py
-from fuzzywuzzy import fuzz
+# rapidfuzz is imported on first use; the fuzzy fallback isn't on the default scoring path
+import numpy as np
 import json
 
-def fuzzy_skill_fraction(required_skills, resume_text, threshold=70):
+from . import metrics
+
+def fuzzy_skill_fraction(required_skills, resume_text, threshold=70, workers=-1):
     """
     For each required skill, see if resume_text contains a fuzzy match above threshold.
     Return fraction matched and list of missing skills.
     """
-    matched = 0
-    missing = []
     resume = resume_text.lower()
-    for rs in required_skills:
-        rs_clean = rs.lower()
-        # quick substring check
-        if rs_clean in resume:
-            matched += 1
-            continue
-        # else try fuzzy on small tokens
-        # test by sliding window of resume words (naive)
-        best = 0
-        for chunk in [rs_clean]:
-            score = fuzz.partial_ratio(chunk, resume)
-            if score > best:
-                best = score
-        if best >= threshold:
-            matched += 1
-        else:
-            missing.append(rs)
+    # quick substring check; only the rest go to fuzzy matching
+    candidates = [rs for rs in required_skills if rs.lower() not in resume]
+    missing = []
+    if candidates:
+        from rapidfuzz import fuzz, process
+        # rapidfuzz's partial_ratio already slides each skill over the whole resume,
+        # so all skills are scored in one cdist call; scores under threshold are pruned to 0
+        with metrics.stage("fuzzy_fallback"):
+            scores = process.cdist([rs.lower() for rs in candidates], [resume],
+                                   scorer=fuzz.partial_ratio, score_cutoff=threshold,
+                                   dtype=np.uint8, workers=workers)
+        missing = [rs for rs, best in zip(candidates, scores[:, 0]) if best < threshold]
+    matched = len(required_skills) - len(missing)
     frac = matched / (len(required_skills) if required_skills else 1)
     return frac, missing
 
-def compute_final_score(h_skill_frac):
-    # MVP: simple mapping: weighted only on hard skills for speed
-    score = round(100 * (0.8 * h_skill_frac + 0.2 * 0.0), 2)  # reserved space for semantic later
+def compute_final_score(h_skill_frac, semantic_sim=0.0):
+    # hard skills dominate; semantic_sim is the JD/resume cosine similarity from semantic.py
+    score = round(100 * (0.8 * h_skill_frac + 0.2 * semantic_sim), 2)
     return score
 
+def relevance_verdict(score):
+    """4-level verdict for compute_relevance's 0-100 skill score"""
+    if score >= 90:
+        return "Excellent"
+    if score >= 80:
+        return "Very Good"
+    if score >= 70:
+        return "Good"
+    return "Bad"
+
 def verdict_from_score(score):
     if score >= 75:
         return "High"
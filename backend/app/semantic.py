@@ -0,0 +1,66 @@
+# backend/app/semantic.py
+# Semantic similarity between a JD and resumes: hashed bag-of-words vectors
+# (sublinear TF, stop words removed, L2-normalized) in SciPy sparse matrices.
+# A batch of resumes is scored against a JD with one sparse matrix-vector product.
+import math
+import zlib
+from collections import Counter
+from typing import List
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+N_FEATURES = 1 << 18
+
+STOP_WORDS = frozenset("""
+a about above after again against all am an and any are as at be because been before being below
+between both but by can could did do does doing down during each few for from further had has have
+having he her here hers herself him himself his how i if in into is it its itself just me more most
+my myself no nor not now of off on once only or other our ours ourselves out over own same she should
+so some such than that the their theirs them themselves then there these they this those through to
+too under until up very was we were what when where which while who whom why will with would you
+your yours yourself yourselves also etc using used use work worked working able well
+""".split())
+
+# token -> feature index; crc32 rather than hash() so every process agrees
+_FEATURES = {}
+_FEATURES_MAX = 500_000
+
+
+def _feature(token: str) -> int:
+    idx = _FEATURES.get(token)
+    if idx is None:
+        idx = zlib.crc32(token.encode()) & (N_FEATURES - 1)
+        if len(_FEATURES) < _FEATURES_MAX:
+            _FEATURES[token] = idx
+    return idx
+
+
+def vectorize_tokens(token_lists: List[List[str]]) -> csr_matrix:
+    """One L2-normalized row per token list (tokens as produced by matching.tokenize)"""
+    indptr = [0]
+    indices = []
+    data = []
+    for tokens in token_lists:
+        counts = Counter(tokens)  # counting is done in C; only distinct tokens are hashed
+        row = {}  # feature -> weight; tokens whose hashes collide share one feature
+        for token, count in counts.items():
+            if token in STOP_WORDS:
+                continue
+            feature = _feature(token)
+            row[feature] = row.get(feature, 0.0) + 1.0 + math.log(count)
+        norm = math.sqrt(sum(w * w for w in row.values())) or 1.0  # after merging collisions: unit length
+        indices.extend(row)
+        data.extend(w / norm for w in row.values())
+        indptr.append(len(indices))
+    return csr_matrix(
+        (np.asarray(data, dtype=np.float32), np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int64)),
+        shape=(len(token_lists), N_FEATURES),
+    )
+
+
+def similarities(resume_matrix: csr_matrix, jd_vector: csr_matrix) -> np.ndarray:
+    """Cosine similarity (0..1) of every resume row with the JD, in one sparse product"""
+    if resume_matrix.shape[0] == 0:
+        return np.zeros(0, dtype=np.float32)
+    return np.clip((resume_matrix @ jd_vector.T).toarray().ravel(), 0.0, 1.0)
@@ -0,0 +1,99 @@
+# backend/app/startup.py
+# Cold-start report: how long the process took to import its modules, run each
+# startup phase and serve its first response. Imported first by main.py so the
+# import timer sees every module loaded after it, until main.py calls imports_done()
+# after its own imports; GET /debug/startup returns the report.
+import builtins
+import os
+import sys
+import threading
+import time
+
+REPORT_TOP_IMPORTS = 25
+
+STARTED = time.perf_counter()
+_WALL0 = time.time()
+_phases = []  # (name, seconds)
+_imports = {}  # module -> (inclusive seconds, nesting depth)
+_first_response = None
+_ready = None
+_local = threading.local()
+_original_import = builtins.__import__
+
+
+def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+    if level == 0 and name in sys.modules:  # already loaded: nothing to time
+        return _original_import(name, globals, locals, fromlist, level)
+    depth = getattr(_local, "depth", 0)
+    _local.depth = depth + 1
+    before = len(sys.modules)
+    start = time.perf_counter()
+    try:
+        return _original_import(name, globals, locals, fromlist, level)
+    finally:
+        elapsed = time.perf_counter() - start
+        _local.depth = depth
+        if len(sys.modules) > before:
+            if level:
+                package = (globals or {}).get("__package__") or ""
+                name = f"{package}.{name or ','.join(fromlist or ())}"
+            if name not in _imports:
+                _imports[name] = (elapsed, depth)
+
+
+builtins.__import__ = _timed_import
+
+
+def _process_age() -> float:
+    """Seconds since the interpreter process started (Linux), else since this module was imported"""
+    try:
+        with open("/proc/self/stat") as f:
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/stat") as f:
+            btime = next(int(line.split()[1]) for line in f if line.startswith("btime"))
+        return max(0.0, time.time() - (btime + start_ticks / os.sysconf("SC_CLK_TCK")))
+    except (OSError, ValueError, IndexError, StopIteration):
+        return time.time() - _WALL0
+
+
+_PRE_IMPORT = _process_age()  # interpreter + server startup before the app was imported
+
+
+def phase(name, started):
+    """Record a startup phase that began at perf_counter() value `started`"""
+    if _ready is None:
+        _phases.append((name, time.perf_counter() - started))
+
+
+def imports_done():
+    """Remove the import timer (lazy imports later on aren't startup cost)"""
+    if builtins.__import__ is _timed_import:  # leave anyone else's hook in place
+        builtins.__import__ = _original_import
+
+
+def finish():
+    """End of startup"""
+    global _ready
+    imports_done()
+    if _ready is None:
+        _ready = time.perf_counter() - STARTED
+
+
+def first_response():
+    global _first_response
+    if _first_response is None:
+        _first_response = time.perf_counter() - STARTED
+
+
+def report() -> dict:
+    """Times in ms; ready/first_response count from when the app started importing (before_app_import_ms after process start)"""
+    ms = lambda seconds: round(seconds * 1000, 3)
+    top = sorted(_imports.items(), key=lambda kv: -kv[1][0])[:REPORT_TOP_IMPORTS]
+    return {
+        "pid": os.getpid(),
+        "before_app_import_ms": ms(_PRE_IMPORT),
+        "ready_ms": ms(_ready) if _ready is not None else None,
+        "first_response_ms": ms(_first_response) if _first_response is not None else None,
+        "phases": [{"phase": name, "ms": ms(seconds)} for name, seconds in _phases],
+        "imports": [{"module": name, "ms": ms(seconds), "depth": depth} for name, (seconds, depth) in top],
+    }
@@ -0,0 +1,303 @@
+# backend/app/talent_pool.py
+# Searchable talent pool: a resumes x skills bit matrix over a canonical skill
+# vocabulary, stored column-major as one memory-mapped uint64 file per 64 skills.
+# Ranking a JD only reads the columns of its own skills (AND + popcount), never resume text.
+# Skills new to the vocabulary are backfilled by a background thread, queued when a JD
+# is stored or edited; a search that gets there first returns a partial result.
+import json
+import logging
+import os
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from typing import List
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from .db import SessionLocal
+from .matching import SkillMatcher, tokenize
+from .models import Resume
+
+try:
+    import fcntl  # serializes writers across uvicorn workers
+except ImportError:  # Windows: single process only
+    fcntl = None
+
+TALENT_POOL_DIR = os.environ.get("TALENT_POOL_DIR", "talent_pool")
+SYNC_BATCH = 1000  # resumes read from the database per batch
+MIN_CAPACITY = 1024
+
+logger = logging.getLogger(__name__)
+
+
+def canonical_skill(skill: str) -> str:
+    """Vocabulary key: the skill's normalized tokens"""
+    return " ".join(tokenize(skill))
+
+
+def popcount(words: np.ndarray) -> np.ndarray:
+    if hasattr(np, "bitwise_count"):  # numpy >= 2.0
+        return np.bitwise_count(words)
+    return np.unpackbits(words.view(np.uint8).reshape(-1, 8), axis=1).sum(axis=1)
+
+
+class TalentPool:
+    """
+    Files in `path`:
+      meta.json  vocabulary, row count, capacity and the last resume id ingested
+      ids.i64    resume id of each row (ascending, rows are appended in id order)
+      w<N>.u64   bit column N: bit b of row r is set if the resume has skill 64*N + b
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._pending = set()  # vocabulary keys queued for backfill
+        self._pending_changed = threading.Condition()
+        self._backfill_thread = None
+
+    # ----------------------------
+    # Storage
+    # ----------------------------
+    def _file(self, name):
+        return os.path.join(self.path, name)
+
+    def _load_meta(self) -> dict:
+        try:
+            with open(self._file("meta.json")) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {"vocab": [], "rows": 0, "capacity": 0, "synced_resume_id": 0}
+
+    def _save_meta(self, meta: dict):
+        tmp = self._file("meta.json.tmp")
+        with open(tmp, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp, self._file("meta.json"))
+
+    @contextmanager
+    def _locked(self):
+        with self._lock:
+            os.makedirs(self.path, exist_ok=True)
+            with open(self._file("lock"), "a") as lock_file:
+                if fcntl:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield self._load_meta()
+                finally:
+                    if fcntl:
+                        fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _n_words(meta) -> int:
+        return (len(meta["vocab"]) + 63) // 64
+
+    def _column(self, meta, word: int, mode="r"):
+        return np.memmap(self._file(f"w{word}.u64"), dtype=np.uint64, mode=mode, shape=(meta["capacity"],))
+
+    def _ids(self, meta, mode="r"):
+        return np.memmap(self._file("ids.i64"), dtype=np.int64, mode=mode, shape=(meta["capacity"],))
+
+    def _resize_files(self, meta, capacity: int):
+        """Grow (or create) every column file to `capacity` rows; new space reads as zeros"""
+        names = ["ids.i64"] + [f"w{w}.u64" for w in range(self._n_words(meta))]
+        for name in names:
+            with open(self._file(name), "ab") as f:
+                f.truncate(capacity * 8)
+        meta["capacity"] = capacity
+
+    def _set_bits(self, meta, rows: np.ndarray, cols: np.ndarray):
+        words, bits = cols >> 6, np.left_shift(np.uint64(1), (cols & 63).astype(np.uint64))
+        for word in np.unique(words):
+            sel = words == word
+            column = self._column(meta, int(word), mode="r+")
+            np.bitwise_or.at(column, rows[sel], bits[sel])
+            column.flush()
+
+    def _match_pairs(self, matcher, col_offset, row_texts):
+        rows, cols = [], []
+        for row, text in row_texts:
+            for idx in matcher.match_indices(text):
+                rows.append(row)
+                cols.append(col_offset + idx)
+        return np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64)
+
+    # ----------------------------
+    # Incremental updates
+    # ----------------------------
+    def _match_stored(self, db: Session, ids: np.ndarray, matcher, col_offset: int, after_id: int, upto_id: int):
+        """(rows, cols) of the matcher's skills for pool rows with after_id < resume id <= upto_id"""
+        query = (db.query(Resume.id, Resume.raw_text)
+                 .filter(Resume.id > after_id, Resume.id <= upto_id)
+                 .order_by(Resume.id)
+                 .yield_per(SYNC_BATCH))
+        parts, batch = [], []
+        for resume_id, text in query:
+            row = int(np.searchsorted(ids, resume_id))
+            if row < len(ids) and ids[row] == resume_id:
+                batch.append((row, text or ""))
+            if len(batch) >= SYNC_BATCH:
+                parts.append(self._match_pairs(matcher, col_offset, batch))
+                batch = []
+        if batch:
+            parts.append(self._match_pairs(matcher, col_offset, batch))
+        if not parts:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        return np.concatenate([r for r, _ in parts]), np.concatenate([c for _, c in parts])
+
+    def _backfill(self, db: Session, keys: List[str]):
+        """
+        Add skills to the vocabulary. The resumes already in the pool are matched
+        without holding the pool lock; only appending the columns takes it.
+        """
+        meta = self._load_meta()  # meta.json is replaced atomically, so this is a consistent snapshot
+        new = [k for k in keys if k not in set(meta["vocab"])]
+        if not new:
+            return
+        rows, synced = meta["rows"], meta["synced_resume_id"]
+        ids = np.array(self._ids(meta)[:rows]) if rows else np.zeros(0, dtype=np.int64)
+        found_rows, found_cols = self._match_stored(db, ids, SkillMatcher(new), 0, 0, synced)
+
+        with self._locked() as meta:
+            known = set(meta["vocab"])
+            keep = [i for i, key in enumerate(new) if key not in known]  # another worker may have added some
+            if not keep:
+                return
+            offset = len(meta["vocab"])
+            column_of = np.full(len(new), -1, dtype=np.int64)
+            column_of[keep] = offset + np.arange(len(keep))
+            meta["vocab"].extend(new[i] for i in keep)
+            self._resize_files(meta, meta["capacity"])  # creates any new column files
+            found_cols = column_of[found_cols]
+            sel = found_cols >= 0
+            self._set_bits(meta, found_rows[sel], found_cols[sel])
+            if meta["synced_resume_id"] > synced:  # rows appended while matching: usually a handful
+                ids = np.array(self._ids(meta)[:meta["rows"]])
+                matcher = SkillMatcher([new[i] for i in keep])
+                self._set_bits(meta, *self._match_stored(db, ids, matcher, offset, synced, meta["synced_resume_id"]))
+            self._save_meta(meta)
+
+    def _backfill_loop(self):
+        while True:
+            with self._pending_changed:
+                while not self._pending:
+                    self._pending_changed.wait()
+                keys = sorted(self._pending)
+            try:
+                with SessionLocal() as db:
+                    self._backfill(db, keys)
+            except Exception:
+                logger.exception("talent pool backfill failed")  # the next search queues them again
+            finally:
+                with self._pending_changed:
+                    self._pending.difference_update(keys)
+
+    def request_backfill(self, skills: List[str]):
+        """Queue skills that aren't in the vocabulary yet for the background backfill; returns immediately"""
+        known = set(self._load_meta()["vocab"])
+        self._queue([key for key in map(canonical_skill, skills) if key and key not in known])
+
+    def _queue(self, keys: List[str]):
+        if not keys:
+            return
+        with self._pending_changed:
+            self._pending.update(keys)
+            self._pending_changed.notify()
+            if self._backfill_thread is None or not self._backfill_thread.is_alive():
+                self._backfill_thread = threading.Thread(target=self._backfill_loop, name="talent-pool-backfill",
+                                                         daemon=True)
+                self._backfill_thread.start()
+
+    def _sync(self, db: Session, meta):
+        """Append rows for resumes stored since the last sync"""
+        query = (db.query(Resume.id, Resume.raw_text)
+                 .filter(Resume.id > meta["synced_resume_id"])
+                 .order_by(Resume.id)
+                 .yield_per(SYNC_BATCH))
+        matcher = SkillMatcher(meta["vocab"])
+        batch = []
+
+        def flush():
+            start = meta["rows"]
+            end = start + len(batch)
+            if end > meta["capacity"]:
+                self._resize_files(meta, max(end, 2 * meta["capacity"], MIN_CAPACITY))
+            ids = self._ids(meta, mode="r+")
+            ids[start:end] = [resume_id for resume_id, _ in batch]
+            ids.flush()
+            pairs = [(start + i, text or "") for i, (_, text) in enumerate(batch)]
+            self._set_bits(meta, *self._match_pairs(matcher, 0, pairs))
+            meta["rows"] = end
+            meta["synced_resume_id"] = batch[-1][0]
+            self._save_meta(meta)
+            batch.clear()
+
+        for resume_id, text in query:
+            batch.append((resume_id, text))
+            if len(batch) >= SYNC_BATCH:
+                flush()
+        if batch:
+            flush()
+
+    def sync(self, db: Session):
+        with self._locked() as meta:
+            self._sync(db, meta)
+
+    # ----------------------------
+    # Queries
+    # ----------------------------
+    def top_candidates(self, db: Session, skills: List[str], k: int = 10) -> dict:
+        """
+        Top-k stored resumes by number of the given skills they contain.
+        Same whole-token matching and score as compute_relevance, except that skills
+        still being backfilled count as missing: those are listed in pending_skills
+        and the result is marked partial.
+        """
+        keys = [canonical_skill(s) for s in skills]
+        with self._locked() as meta:
+            self._sync(db, meta)  # only resumes stored since the last ingest job
+        index = {key: i for i, key in enumerate(meta["vocab"])}
+        pending = [s for s, key in zip(skills, keys) if key and key not in index]
+        self._queue([key for key in keys if key and key not in index])
+        result = {"partial": bool(pending), "pending_skills": pending, "candidates": []}
+        rows = meta["rows"]
+        if not rows or not skills or k <= 0:
+            return result
+
+        columns = {}  # word -> memmap, opened once per query
+
+        def column(word):
+            if word not in columns:
+                columns[word] = self._column(meta, word)[:rows]
+            return columns[word]
+
+        # Skills sharing a canonical key each count, as in compute_relevance,
+        # so columns are grouped by weight: counts = sum(weight * popcount(column & mask))
+        masks = {}  # (word, weight) -> mask
+        for key, weight in Counter(key for key in keys if key in index).items():
+            col = index[key]
+            masks[(col >> 6, weight)] = masks.get((col >> 6, weight), 0) | (1 << (col & 63))
+        counts = np.zeros(rows, dtype=np.uint32)
+        for (word, weight), mask in masks.items():
+            counts += popcount(column(word) & np.uint64(mask)).astype(np.uint32) * np.uint32(weight)
+
+        k = min(k, rows)
+        top = np.argpartition(-counts.astype(np.int64), k - 1)[:k]
+        ids = self._ids(meta)
+        top = sorted(top, key=lambda r: (-int(counts[r]), int(ids[r])))
+        filenames = dict(db.query(Resume.id, Resume.filename).filter(Resume.id.in_([int(ids[r]) for r in top])))
+
+        for r in top:
+            matched = [s for s, key in zip(skills, keys)
+                       if key in index and (int(column(index[key] >> 6)[r]) >> (index[key] & 63)) & 1]
+            result["candidates"].append({
+                "resume_id": int(ids[r]),
+                "filename": filenames.get(int(ids[r])),
+                "score": int(int(counts[r]) / len(skills) * 100),
+                "matched_skills": matched,
+            })
+        return result
+
+
+POOL = TalentPool(TALENT_POOL_DIR)
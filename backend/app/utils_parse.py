@@ -1,9 +1,17 @@
 # backend/app/utils_parse.py
-import fitz  # PyMuPDF
-import docx2txt
+# fitz (PyMuPDF) and docx2txt are imported on first use: they are slow to import,
+# most requests never parse a file, and uploads are parsed in extraction's worker processes
 import re
+from io import BytesIO
+
+SKILL_LINE_RE = re.compile(r"skill|requirement|responsibilit|experience", re.IGNORECASE)
+LINE_SPLIT_RE = re.compile(r",|;|-|\\||/| and ")
+SKILLS_TAIL_RE = re.compile(r"skills?:\s*(.*)", re.IGNORECASE)
+TAIL_SPLIT_RE = re.compile(r",|;|\\||/| and ")
+SKILL_CHARS_RE = re.compile(r"[^A-Za-z0-9\+\#\.\- ]")
 
 def extract_text_from_pdf(path: str) -> str:
+    import fitz  # PyMuPDF
     text = []
     doc = fitz.open(path)
     for page in doc:
@@ -11,6 +19,7 @@ def extract_text_from_pdf(path: str) -> str:
     return "\n".join(text)
 
 def extract_text_from_docx(path: str) -> str:
+    import docx2txt
     return docx2txt.process(path)
 
 def extract_text_from_file(path: str) -> str:
@@ -22,6 +31,31 @@ def extract_text_from_file(path: str) -> str:
     else:
         raise ValueError("Unsupported file type")
 
+def extract_pdf_pages(data: bytes, start: int = 0, stop: int = None):
+    """
+    Text of pages [start, stop) of an in-memory PDF.
+    Returns (text, total_page_count) so callers can plan the remaining ranges.
+    """
+    import fitz  # PyMuPDF
+    with fitz.open(stream=data, filetype="pdf") as doc:
+        stop = doc.page_count if stop is None else min(stop, doc.page_count)
+        text = "\n".join(doc[i].get_text() for i in range(start, stop))
+        return text, doc.page_count
+
+def extract_text_from_docx_bytes(data: bytes) -> str:
+    import docx2txt
+    return docx2txt.process(BytesIO(data))
+
+def extract_text_from_bytes(data: bytes, filename: str) -> str:
+    """Same as extract_text_from_file, but for an in-memory upload"""
+    lower = filename.lower()
+    if lower.endswith(".pdf"):
+        return extract_pdf_pages(data)[0]
+    elif lower.endswith(".docx") or lower.endswith(".doc"):
+        return extract_text_from_docx_bytes(data)
+    else:
+        raise ValueError("Unsupported file type")
+
 def simple_skill_extractor_from_jd(text: str):
     """
     Naive skill extraction: look for lines containing keywords like 'skills', 'requirements', or comma lists.
@@ -36,26 +70,28 @@ def simple_skill_extractor_from_jd(text: str):
         if len(l) == 0: 
             continue
         # If line contains commas and contains keywords like 'skill' or 'experience' or is in a skills block
-        if re.search(r"skill|requirement|responsibilit|experience", l, re.IGNORECASE) or ("," in l and len(l.split(",")) <= 12):
-            parts = re.split(r",|;|-|\\||/| and ", l)
+        if SKILL_LINE_RE.search(l) or ("," in l and len(l.split(",")) <= 12):
+            parts = LINE_SPLIT_RE.split(l)
             for p in parts:
                 p = p.strip()
                 if len(p) >= 2 and len(p) <= 60 and len(p.split()) <= 6:
                     skills.append(p)
     # fallback: take words after 'skills:' or 'must have'
-    m = re.search(r"skills?:\s*(.*)", text, re.IGNORECASE)
+    m = SKILLS_TAIL_RE.search(text)
     if m:
         tail = m.group(1)
-        parts = re.split(r",|;|\\||/| and ", tail)
+        parts = TAIL_SPLIT_RE.split(tail)
         for p in parts:
             p = p.strip()
             if p:
                 skills.append(p)
     # Clean & dedupe
     cleaned = []
+    seen = set()
     for s in skills:
-        s = re.sub(r"[^A-Za-z0-9\+\#\.\- ]", " ", s)
+        s = SKILL_CHARS_RE.sub(" ", s)
         s = " ".join(s.split())
-        if len(s) > 1 and s.lower() not in [c.lower() for c in cleaned]:
+        if len(s) > 1 and s.lower() not in seen:
+            seen.add(s.lower())
             cleaned.append(s)
     return cleaned
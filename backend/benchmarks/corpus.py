@@ -0,0 +1,84 @@
+# backend/benchmarks/corpus.py
+# Deterministic synthetic JDs and resumes for benchmarks: same seed, same corpus
+import io
+import random
+
+BASE_SKILLS = [
+    "Python", "Java", "JavaScript", "TypeScript", "Go", "Rust", "C++", "C#", "SQL", "NoSQL",
+    "Docker", "Kubernetes", "Terraform", "AWS", "Azure", "GCP", "Linux", "Git", "CI/CD",
+    "React", "Angular", "Vue", "Node.js", "Django", "Flask", "FastAPI", "Spring Boot",
+    "Machine Learning", "Deep Learning", "NLP", "Computer Vision", "TensorFlow", "PyTorch",
+    "Pandas", "NumPy", "Spark", "Kafka", "Airflow", "Redis", "PostgreSQL", "MongoDB",
+    "GraphQL", "REST APIs", "Microservices", "Agile", "Scrum", "Communication", "Leadership",
+]
+QUALIFIERS = ["Advanced", "Applied", "Distributed", "Cloud", "Data", "Realtime", "Secure", "Scalable"]
+FILLER = (
+    "worked with cross functional teams to design build and ship features for customers "
+    "improved reliability performance and cost of production services owned delivery "
+    "mentored engineers reviewed code wrote documentation and automated deployments "
+    "collaborated on requirements analysis testing monitoring and incident response"
+).split()
+WORDS_PER_PAGE = 450
+
+
+def skill_vocabulary(n: int, seed: int = 0) -> list:
+    """n distinct skill names: the real-world list first, then qualified variants"""
+    rng = random.Random(seed)
+    vocab = list(BASE_SKILLS)
+    while len(vocab) < n:
+        candidate = f"{rng.choice(QUALIFIERS)} {rng.choice(BASE_SKILLS)} {len(vocab)}"
+        vocab.append(candidate)
+    return vocab[:n]
+
+
+def make_jd(n_skills: int, seed: int = 0) -> str:
+    """JD text mixing the formats extract_skills_from_jd handles: bullets, colon lists, inline"""
+    rng = random.Random(seed)
+    skills = skill_vocabulary(n_skills, seed)
+    lines = ["About the role", "We are hiring engineers to build our hiring platform.", ""]
+    i = 0
+    while i < len(skills):
+        style = rng.randrange(3)
+        take = skills[i:i + rng.randint(2, 6)]
+        if style == 0:
+            lines.extend(f"- {s}" for s in take)
+        elif style == 1:
+            lines.append(f"{rng.choice(['Skills', 'Requirements', 'Nice to have'])}: {', '.join(take)}")
+        else:
+            lines.append(", ".join(take[:-1]) + f" and {take[-1]}" if len(take) > 1 else take[0])
+        i += len(take)
+    return "\n".join(lines)
+
+
+def make_resume(jd_skills: list, pages: int, match_ratio: float = 0.5, seed: int = 0) -> str:
+    """Resume text of roughly `pages` pages containing about match_ratio of the JD's skills"""
+    rng = random.Random(seed)
+    present = [s for s in jd_skills if rng.random() < match_ratio]
+    words = [rng.choice(FILLER) for _ in range(pages * WORDS_PER_PAGE)]
+    for skill in present:
+        words.insert(rng.randrange(len(words) + 1), skill)
+    lines = [" ".join(words[i:i + 12]) for i in range(0, len(words), 12)]
+    return "Candidate Name\nExperience\n" + "\n".join(lines)
+
+
+def to_pdf(text: str) -> bytes:
+    import fitz  # PyMuPDF
+
+    doc = fitz.open()
+    lines = text.splitlines()
+    per_page = 50
+    for start in range(0, len(lines), per_page):
+        page = doc.new_page()
+        page.insert_textbox(page.rect + (36, 36, -36, -36), "\n".join(lines[start:start + per_page]), fontsize=9)
+    return doc.tobytes()
+
+
+def to_docx(text: str) -> bytes:
+    import docx
+
+    document = docx.Document()
+    for line in text.splitlines():
+        document.add_paragraph(line)
+    buf = io.BytesIO()
+    document.save(buf)
+    return buf.getvalue()
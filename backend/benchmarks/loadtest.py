@@ -0,0 +1,399 @@
+# backend/benchmarks/loadtest.py
+"""
+End-to-end load test: starts `uvicorn app.main:app` with N workers on a throwaway
+database and drives it with an asyncio HTTP client at increasing concurrency.
+
+    cd backend
+    python -m benchmarks.loadtest --workers 2 --concurrency 1,8,32 --duration 20 --out load.json
+    python -m benchmarks.loadtest --url http://localhost:8000 --concurrency 16   # existing server
+
+Each concurrency level runs closed-loop for --duration seconds over a weighted mix of
+requests (--mix). The JSON report has throughput, p50/p95/p99 latency and error rates,
+overall and per request type, plus each worker's RSS before/after/peak per level:
+steady growth across levels is what a leak (e.g. an unbounded cache) looks like.
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+
+import httpx
+
+try:
+    import psutil
+except ImportError:  # optional: RSS is read from /proc instead
+    psutil = None
+
+from .corpus import make_jd, make_resume, skill_vocabulary, to_docx, to_pdf
+from .run import percentile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_MIX = "evaluate=70,evaluate_cached=10,jd=5,batch=5,extract=5,leaderboard=5"
+MEMORY_SAMPLE_INTERVAL = 0.5  # seconds
+
+
+# ----------------------------
+# Server under test
+# ----------------------------
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(workers: int, port: int, workdir: str) -> subprocess.Popen:
+    """uvicorn in `workdir`, so the database, talent pool and uploads all land there"""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [BACKEND_DIR, env.get("PYTHONPATH")]))
+    env["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'loadtest.db')}"
+    env["JD_SNAPSHOT_PATH"] = os.path.join(workdir, "jd_snapshot.pkl")
+    env["JD_UPDATES_LOG"] = os.path.join(workdir, "jd_updates.log")
+    env["TALENT_POOL_DIR"] = os.path.join(workdir, "talent_pool")
+    env["JOBS_DIR"] = os.path.join(workdir, "jobs")
+    cmd = [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+           "--workers", str(workers), "--log-level", "warning"]
+    return subprocess.Popen(cmd, cwd=workdir, env=env)
+
+
+def wait_ready(base_url: str, proc: subprocess.Popen, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc is not None and proc.poll() is not None:
+            raise RuntimeError(f"server exited with code {proc.returncode}")
+        try:
+            if httpx.get(f"{base_url}/cache_stats", timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"server not ready after {timeout}s")
+
+
+def stop_server(proc: subprocess.Popen):
+    proc.terminate()
+    try:
+        proc.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+
+
+def worker_pids(proc: subprocess.Popen) -> list:
+    """uvicorn worker processes (the master itself when --workers 1)"""
+    children = []
+    for entry in os.listdir("/proc") if os.path.isdir("/proc") else []:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+            with open(f"/proc/{entry}/cmdline", "rb") as f:
+                cmdline = f.read()
+        except (OSError, ValueError, IndexError):
+            continue
+        if ppid == proc.pid and b"spawn_main" in cmdline:  # not the multiprocessing resource tracker
+            children.append(int(entry))
+    return sorted(children) or [proc.pid]
+
+
+def rss_kb(pid: int):
+    """Resident memory in kB, via psutil when installed, else /proc; None if unavailable"""
+    if psutil is not None:
+        try:
+            return psutil.Process(pid).memory_info().rss // 1024
+        except psutil.Error:
+            return None
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+class MemorySampler:
+    """Peak RSS per worker while a level runs"""
+
+    def __init__(self, pids):
+        self.pids = pids
+        self.start = {pid: rss_kb(pid) for pid in pids}
+        self.peak = dict(self.start)
+
+    def sample(self):
+        for pid in self.pids:
+            value = rss_kb(pid)
+            if value is not None and (self.peak.get(pid) is None or value > self.peak[pid]):
+                self.peak[pid] = value
+
+    async def run(self, stop: asyncio.Event):
+        while not stop.is_set():
+            self.sample()
+            try:
+                await asyncio.wait_for(stop.wait(), MEMORY_SAMPLE_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+
+    def report(self) -> dict:
+        report = {}
+        for pid in self.pids:
+            start, end = self.start.get(pid), rss_kb(pid)
+            report[str(pid)] = {
+                "start_kb": start,
+                "end_kb": end,
+                "peak_kb": self.peak.get(pid),
+                "growth_kb": end - start if start is not None and end is not None else None,
+            }
+        return report
+
+
+# ----------------------------
+# Workload
+# ----------------------------
+class Workload:
+    """Synthetic JDs and resumes (texts plus PDF/DOCX files), and one coroutine per request type"""
+
+    def __init__(self, n_jds, n_resumes, pages, skills_per_jd, seed):
+        self.rng = random.Random(seed)
+        self.jd_texts = [make_jd(skills_per_jd, seed + i) for i in range(n_jds)]
+        vocab = skill_vocabulary(skills_per_jd, seed)
+        self.resumes = [make_resume(vocab, pages, match_ratio=self.rng.random(), seed=seed + i)
+                        for i in range(n_resumes)]
+        n_files = max(1, min(10, n_resumes))
+        self.files = [(f"resume{i}.pdf", to_pdf(self.resumes[i]), "application/pdf") for i in range(0, n_files, 2)]
+        self.files += [(f"resume{i}.docx", to_docx(self.resumes[i]),
+                        "application/vnd.openxmlformats-officedocument.wordprocessingml.document")
+                       for i in range(1, n_files, 2)]
+        self.jd_ids = []
+        self.counter = 0
+
+    async def setup(self, client):
+        for text in self.jd_texts:
+            response = await client.post("/jd", json={"title": "loadtest", "jd": text})
+            response.raise_for_status()
+            self.jd_ids.append(response.json()["jd_id"])
+
+    def _unique(self, text):
+        self.counter += 1
+        return f"{text}\nref {self.counter} {self.rng.random()}"  # defeats the result cache
+
+    # Each op returns the response; it counts as an error unless 200 without an "error" message
+    async def op_jd(self, client):
+        return await client.post("/jd", json={"title": "loadtest", "jd": self._unique(self.rng.choice(self.jd_texts))})
+
+    async def op_evaluate(self, client):
+        return await client.post("/evaluate_resume", json={
+            "jd_id": self.rng.choice(self.jd_ids), "resume_text": self._unique(self.rng.choice(self.resumes))})
+
+    async def op_evaluate_cached(self, client):
+        return await client.post("/evaluate_resume", json={
+            "jd_id": self.jd_ids[0], "resume_text": self.resumes[self.rng.randrange(min(20, len(self.resumes)))]})
+
+    async def op_batch(self, client):
+        texts = [self._unique(self.rng.choice(self.resumes)) for _ in range(8)]
+        name, data, mime = self.rng.choice(self.files)
+        return await client.post("/evaluate_batch", data={"jd_id": self.rng.choice(self.jd_ids), "resume_texts": texts},
+                                 files=[("files", (name, data, mime))])
+
+    async def op_extract(self, client):
+        name, data, mime = self.rng.choice(self.files)
+        return await client.post("/extract", files={"file": (name, data, mime)})
+
+    async def op_leaderboard(self, client):
+        return await client.get(f"/jd/{self.rng.choice(self.jd_ids)}/leaderboard", params={"limit": 10})
+
+    async def op_job(self, client):
+        buf = io.BytesIO()
+        with zipfile.ZipFile(buf, "w") as zf:
+            for name, data, _ in self.files:
+                zf.writestr(name, data)
+        return await client.post("/jobs", data={"jd_id": self.rng.choice(self.jd_ids)},
+                                 files={"file": ("resumes.zip", buf.getvalue(), "application/zip")})
+
+
+def response_error(response):
+    if response.status_code != 200:
+        return f"http_{response.status_code}"
+    if response.headers.get("content-type", "").startswith("application/json"):
+        body = response.json()
+        if isinstance(body, dict) and body.get("error"):  # job status always has an "error" field
+            return "app_error"
+    else:  # NDJSON from /evaluate_batch: one line per resume
+        for line in response.text.splitlines():
+            if line and json.loads(line).get("error"):
+                return "app_error"
+    return None
+
+
+def parse_mix(spec: str) -> dict:
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        if not hasattr(Workload, f"op_{name.strip()}"):
+            raise SystemExit(f"unknown request type in --mix: {name}")
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+def summarize_level(samples, elapsed):
+    """samples: (op, seconds, error or None)"""
+    def stats(rows):
+        latencies = sorted(seconds for _, seconds, _ in rows)
+        errors = {}
+        for _, _, error in rows:
+            if error:
+                errors[error] = errors.get(error, 0) + 1
+        n = len(rows)
+        return {
+            "requests": n,
+            "throughput_rps": round(n / elapsed, 2) if elapsed else 0.0,
+            "error_rate": round(sum(errors.values()) / n, 4) if n else 0.0,
+            "errors": errors,
+            "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+            "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+            "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+            "max_ms": round(latencies[-1] * 1000, 2) if latencies else 0.0,
+        }
+
+    by_op = {}
+    for row in samples:
+        by_op.setdefault(row[0], []).append(row)
+    return {**stats(samples), "ops": {op: stats(rows) for op, rows in sorted(by_op.items())}}
+
+
+async def run_level(client, workload, mix, concurrency, duration, pids):
+    ops, weights = list(mix), list(mix.values())
+    samples = []
+    deadline = time.perf_counter() + duration
+
+    async def user():
+        while time.perf_counter() < deadline:
+            op = workload.rng.choices(ops, weights)[0]
+            start = time.perf_counter()
+            try:
+                error = response_error(await getattr(workload, f"op_{op}")(client))
+            except httpx.HTTPError as e:
+                error = type(e).__name__
+            samples.append((op, time.perf_counter() - start, error))
+
+    sampler = MemorySampler(pids) if pids else None
+    stop = asyncio.Event()
+    sampling = asyncio.create_task(sampler.run(stop)) if sampler else None
+    started = time.perf_counter()
+    await asyncio.gather(*(user() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    if sampling:
+        await sampling
+    result = {"concurrency": concurrency, "elapsed_s": round(elapsed, 3), **summarize_level(samples, elapsed)}
+    if sampler:
+        result["memory"] = sampler.report()
+    return result
+
+
+async def drive(args, base_url, pids):
+    workload = Workload(args.jds, args.resumes, args.pages, args.skills, args.seed)
+    mix = parse_mix(args.mix)
+    levels = [int(c) for c in args.concurrency.split(",")]
+    limits = httpx.Limits(max_connections=max(levels), max_keepalive_connections=max(levels))
+    async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout, limits=limits) as client:
+        await workload.setup(client)
+        if args.warmup:
+            await run_level(client, workload, mix, min(levels), args.warmup, None)
+        baseline = {str(pid): rss_kb(pid) for pid in pids}
+        results = []
+        for concurrency in levels:
+            result = await run_level(client, workload, mix, concurrency, args.duration, pids)
+            results.append(result)
+            print(f"c={concurrency:<4} {result['throughput_rps']:>9.1f} req/s  p50 {result['p50_ms']:>8.1f} ms  "
+                  f"p95 {result['p95_ms']:>8.1f} ms  p99 {result['p99_ms']:>8.1f} ms  "
+                  f"errors {result['error_rate']:.2%}", file=sys.stderr)
+        final = {str(pid): rss_kb(pid) for pid in pids}
+    memory = {
+        pid: {"baseline_kb": baseline[pid], "final_kb": final[pid],
+              "growth_kb": final[pid] - baseline[pid] if baseline[pid] is not None and final[pid] is not None else None}
+        for pid in baseline
+    }
+    return results, memory
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=2, help="uvicorn --workers")
+    parser.add_argument("--url", help="test an already running server instead of starting one (no memory stats)")
+    parser.add_argument("--concurrency", default="1,4,16,32", help="comma-separated levels to sweep")
+    parser.add_argument("--duration", type=float, default=15.0, help="seconds per concurrency level")
+    parser.add_argument("--warmup", type=float, default=3.0, help="seconds of untimed load before the sweep")
+    parser.add_argument("--mix", default=DEFAULT_MIX,
+                        help="request weights; types: jd, evaluate, evaluate_cached, batch, extract, leaderboard, job")
+    parser.add_argument("--jds", type=int, default=10, help="distinct JDs registered up front")
+    parser.add_argument("--skills", type=int, default=40, help="skills per JD")
+    parser.add_argument("--resumes", type=int, default=100, help="distinct resume texts")
+    parser.add_argument("--pages", type=int, default=2, help="pages per resume")
+    parser.add_argument("--timeout", type=float, default=60.0, help="per-request timeout (s)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="write the JSON report here (default: stdout)")
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.TemporaryDirectory()
+    proc = None
+    base_url = args.url
+    try:
+        if base_url is None:
+            port = free_port()
+            base_url = f"http://127.0.0.1:{port}"
+            proc = start_server(args.workers, port, workdir.name)
+            wait_ready(base_url, proc)
+        else:
+            wait_ready(base_url, None)
+        pids = []
+        if proc is not None:
+            deadline = time.monotonic() + 30
+            while len(pids) < args.workers and time.monotonic() < deadline:  # workers start one by one
+                pids = worker_pids(proc)
+                time.sleep(0.2)
+        levels, memory = asyncio.run(drive(args, base_url, pids))
+    finally:
+        if proc is not None:
+            stop_server(proc)
+        workdir.cleanup()
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "workers": args.workers if args.url is None else None,
+            "url": args.url,
+            "duration_s": args.duration,
+            "mix": parse_mix(args.mix),
+            "jds": args.jds,
+            "skills_per_jd": args.skills,
+            "resumes": args.resumes,
+            "pages": args.pages,
+            "seed": args.seed,
+        },
+        "levels": levels,
+        "memory": memory,
+    }
+    output = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+    return 1 if any(level["error_rate"] > 0 for level in levels) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,215 @@
+# backend/benchmarks/run.py
+"""
+Microbenchmarks for the scoring and parsing hot paths.
+
+    cd backend
+    python -m benchmarks.run --out bench.json                      # save a baseline
+    python -m benchmarks.run --baseline bench.json --threshold 0.2  # fail on >20% regressions
+
+Each stage is timed separately, then end-to-end through FastAPI's TestClient.
+The report is JSON with p50/p95/p99 latencies (ms) and throughput (calls/s).
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+from .corpus import make_jd, make_resume, to_docx, to_pdf
+
+SKILL_COUNTS = [10, 100, 500]
+PAGE_COUNTS = [1, 5, 20]
+QUICK_SKILL_COUNTS = [10, 100]
+QUICK_PAGE_COUNTS = [1, 5]
+
+
+def percentile(sorted_samples, pct):
+    """Nearest-rank percentile"""
+    if not sorted_samples:
+        return 0.0
+    rank = max(0, min(len(sorted_samples) - 1, int(round(pct / 100 * len(sorted_samples))) - 1))
+    return sorted_samples[rank]
+
+
+def summarize(samples):
+    samples = sorted(samples)
+    mean = sum(samples) / len(samples)
+    return {
+        "n": len(samples),
+        "p50_ms": round(percentile(samples, 50) * 1000, 4),
+        "p95_ms": round(percentile(samples, 95) * 1000, 4),
+        "p99_ms": round(percentile(samples, 99) * 1000, 4),
+        "mean_ms": round(mean * 1000, 4),
+        "throughput_per_s": round(1 / mean, 2) if mean else 0.0,
+    }
+
+
+def measure(fn, repeat, warmup=2):
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+class Runner:
+    def __init__(self, repeat, only=None):
+        self.repeat = repeat
+        self.only = only
+        self.results = {}
+
+    def run(self, name, fn, repeat=None):
+        if self.only and self.only not in name:
+            return
+        self.results[name] = stats = measure(fn, repeat or self.repeat)
+        print(f"{name:<60} p50 {stats['p50_ms']:>10.3f} ms  p95 {stats['p95_ms']:>10.3f} ms", file=sys.stderr)
+
+
+def bench_stages(runner, skill_counts, page_counts, seed):
+    from app.main import compute_relevance, extract_skills_from_jd, normalize
+    from app.matching import SkillMatcher, tokenize
+    from app.scoring import fuzzy_skill_fraction
+    from app.semantic import similarities, vectorize_tokens
+    from app.utils_parse import extract_text_from_bytes, simple_skill_extractor_from_jd
+
+    for pages in page_counts:
+        resume = make_resume([], pages, seed=seed)
+        runner.run(f"normalize[pages={pages}]", lambda: normalize(resume))
+
+    for n_skills in skill_counts:
+        jd = make_jd(n_skills, seed)
+        runner.run(f"extract_skills_from_jd[skills={n_skills}]", lambda: extract_skills_from_jd(jd))
+        runner.run(f"simple_skill_extractor_from_jd[skills={n_skills}]", lambda: simple_skill_extractor_from_jd(jd))
+        skills = extract_skills_from_jd(jd)
+        runner.run(f"SkillMatcher[skills={n_skills}]", lambda: SkillMatcher(skills))
+        matcher = SkillMatcher(skills)
+        for pages in page_counts:
+            resume = make_resume(skills, pages, seed=seed)
+            tag = f"skills={n_skills},pages={pages}"
+            runner.run(f"compute_relevance[{tag}]", lambda: compute_relevance("", resume, matcher))
+            runner.run(f"compute_relevance_uncompiled[{tag}]", lambda: compute_relevance(jd, resume))
+            # fuzzy matching is by far the slowest stage; fewer samples keep the suite quick
+            runner.run(f"fuzzy_skill_fraction[{tag}]", lambda: fuzzy_skill_fraction(skills, resume),
+                       repeat=max(5, runner.repeat // 4))
+
+    # Semantic similarity for a whole batch: vectorize + one sparse product
+    jd = make_jd(skill_counts[-1], seed)
+    jd_vector = vectorize_tokens([tokenize(jd)])
+    skills = extract_skills_from_jd(jd)
+    for batch_size in (100, 1000):
+        token_lists = [tokenize(make_resume(skills, 1, seed=seed + i)) for i in range(batch_size)]
+        runner.run(f"semantic_batch[resumes={batch_size},pages=1]",
+                   lambda: similarities(vectorize_tokens(token_lists), jd_vector), repeat=max(5, runner.repeat // 4))
+
+    skills = extract_skills_from_jd(make_jd(skill_counts[0], seed))
+    for pages in page_counts:
+        text = make_resume(skills, pages, seed=seed)
+        pdf, docx = to_pdf(text), to_docx(text)
+        runner.run(f"extract_text_from_bytes[pdf,pages={pages}]", lambda: extract_text_from_bytes(pdf, "r.pdf"))
+        runner.run(f"extract_text_from_bytes[docx,pages={pages}]", lambda: extract_text_from_bytes(docx, "r.docx"))
+
+
+def bench_end_to_end(runner, skill_counts, page_counts, seed):
+    from fastapi.testclient import TestClient
+
+    from app.main import app, extract_skills_from_jd
+
+    with TestClient(app) as client:
+        for n_skills in skill_counts:
+            jd = make_jd(n_skills, seed)
+            runner.run(f"POST /jd[skills={n_skills}]",
+                       lambda: client.post("/jd", json={"title": "bench", "jd": jd}))
+            jd_id = client.post("/jd", json={"title": "bench", "jd": jd}).json()["jd_id"]
+            skills = extract_skills_from_jd(jd)
+            for pages in page_counts:
+                resume = make_resume(skills, pages, seed=seed)
+                tag = f"skills={n_skills},pages={pages}"
+                counter = iter(range(10 ** 9))
+                # a unique suffix per call defeats the result cache
+                runner.run(f"POST /evaluate_resume cold[{tag}]", lambda: client.post(
+                    "/evaluate_resume", json={"jd_id": jd_id, "resume_text": f"{resume} n{next(counter)}"}))
+                runner.run(f"POST /evaluate_resume cached[{tag}]", lambda: client.post(
+                    "/evaluate_resume", json={"jd_id": jd_id, "resume_text": resume}))
+
+
+def compare(current, baseline, threshold, metric, min_ms):
+    """Stages whose metric grew by more than threshold (fraction) over the baseline"""
+    regressions = []
+    for name, stats in current.items():
+        base = baseline.get(name)
+        if not base or base[metric] < min_ms:
+            continue
+        ratio = stats[metric] / base[metric]
+        if ratio > 1 + threshold:
+            regressions.append({"stage": name, "baseline": base[metric], "current": stats[metric],
+                                "ratio": round(ratio, 3)})
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=30, help="samples per stage")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--quick", action="store_true", help="smaller corpus, for CI")
+    parser.add_argument("--only", help="run only stages whose name contains this string")
+    parser.add_argument("--skip-e2e", action="store_true", help="skip the TestClient benchmarks")
+    parser.add_argument("--out", help="write the JSON report here (default: stdout)")
+    parser.add_argument("--baseline", help="JSON report to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown, e.g. 0.2 = 20%%")
+    parser.add_argument("--metric", default="p50_ms", choices=["p50_ms", "p95_ms", "p99_ms", "mean_ms"])
+    parser.add_argument("--min-ms", type=float, default=0.05, help="ignore stages faster than this in the baseline")
+    args = parser.parse_args(argv)
+
+    # Never touch the real database, nor the state files the app rewrites (JD snapshot at shutdown etc.)
+    tmpdir = tempfile.TemporaryDirectory()
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmpdir.name, 'bench.db')}"
+    os.environ["JD_SNAPSHOT_PATH"] = os.path.join(tmpdir.name, "jd_snapshot.pkl")
+    os.environ["JD_UPDATES_LOG"] = os.path.join(tmpdir.name, "jd_updates.log")
+    os.environ["TALENT_POOL_DIR"] = os.path.join(tmpdir.name, "talent_pool")
+    os.environ["JOBS_DIR"] = os.path.join(tmpdir.name, "jobs")
+
+    skill_counts = QUICK_SKILL_COUNTS if args.quick else SKILL_COUNTS
+    page_counts = QUICK_PAGE_COUNTS if args.quick else PAGE_COUNTS
+    runner = Runner(args.repeat, args.only)
+    bench_stages(runner, skill_counts, page_counts, args.seed)
+    if not args.skip_e2e:
+        bench_end_to_end(runner, skill_counts, page_counts, args.seed)
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "repeat": args.repeat,
+            "seed": args.seed,
+            "quick": args.quick,
+        },
+        "results": runner.results,
+    }
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(runner.results, baseline, args.threshold, args.metric, args.min_ms)
+        report["regressions"] = regressions
+        for r in regressions:
+            print(f"REGRESSION {r['stage']}: {r['baseline']} -> {r['current']} ms ({r['ratio']}x)", file=sys.stderr)
+        exit_code = 1 if regressions else 0
+
+    output = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+    tmpdir.cleanup()
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,15 @@
+# backend/tests/conftest.py
+# The app reads its database URL and state-file paths at import, so point them at a
+# temporary directory before any test imports it.
+import os
+import sys
+import tempfile
+
+_TMP = tempfile.mkdtemp(prefix="resume_relevance_tests_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_TMP, 'test.db')}"
+os.environ["JD_SNAPSHOT_PATH"] = os.path.join(_TMP, "jd_snapshot.pkl")
+os.environ["JD_UPDATES_LOG"] = os.path.join(_TMP, "jd_updates.log")
+os.environ["TALENT_POOL_DIR"] = os.path.join(_TMP, "talent_pool")
+os.environ["JOBS_DIR"] = os.path.join(_TMP, "jobs")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
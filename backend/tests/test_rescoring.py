@@ -0,0 +1,98 @@
+# backend/tests/test_rescoring.py
+# Incremental re-scoring after a JD edit must store exactly what scoring every
+# resume from scratch against the new skill list would.
+import json
+import random
+
+import pytest
+
+from app import rescoring
+from app.db import SessionLocal, init_db
+from app.jd_store import create_jd
+from app.main import SCORING_VERSION, compute_relevance
+from app.matching import SkillMatcher
+from app.models import Evaluation, Resume
+
+SKILLS = ["Python", "SQL", "machine learning", "Docker", "AWS", "React", "node.js", "C++"]
+WORDS = ["python", "sql", "machine", "learning", "docker", "aws", "react", "node.js", "c++", "java",
+         "excel", "team", "led", "built", "the", "and"]
+N_RESUMES = 60
+
+EDITS = {
+    "add_only": SKILLS + ["Java", "Excel", "Kubernetes"],
+    "remove_only": ["SQL", "Docker", "React", "C++"],
+    "reorder": list(reversed(SKILLS)),
+    "add_and_remove": ["Java", "Python", "machine learning", "Go"],
+}
+
+
+@pytest.fixture
+def db():
+    init_db()
+    with SessionLocal() as session:
+        yield session
+
+
+@pytest.fixture
+def jd_id(db):
+    """A JD with N_RESUMES stored evaluations, scored against SKILLS"""
+    rng = random.Random(0)
+    jd = create_jd(db, "Engineer", "engineer", SKILLS)
+    matcher = SkillMatcher(SKILLS)
+    for i in range(N_RESUMES):
+        text = " ".join(rng.choices(WORDS, k=rng.randint(5, 40)))
+        resume = Resume(filename=f"r{i}.txt", raw_text=text, content_hash=f"hash{i}")
+        db.add(resume)
+        db.flush()
+        result = compute_relevance("", text, matcher=matcher, similarity=rng.random())
+        db.add(Evaluation(resume_id=resume.id, jd_id=jd.id, score=result["score"], verdict=result["verdict"],
+                          matched_skills=json.dumps(result["matched_skills"]),
+                          missing_skills=json.dumps(result["missing_skills"]),
+                          semantic_score=result["semantic_score"], final_score=result["final_score"]))
+    db.commit()
+    return jd.id
+
+
+def assert_matches_full_rescore(db, jd_id, skills):
+    matcher = SkillMatcher(skills)
+    rows = db.query(Evaluation, Resume.raw_text).join(Resume, Resume.id == Evaluation.resume_id) \
+        .filter(Evaluation.jd_id == jd_id).all()
+    assert len(rows) == N_RESUMES
+    for ev, text in rows:
+        expected = compute_relevance("", text, matcher=matcher, similarity=ev.semantic_score / 100)
+        assert ev.score == expected["score"]
+        assert ev.verdict == expected["verdict"]
+        assert json.loads(ev.matched_skills) == [s for s in skills if s in expected["matched_skills"]]
+        assert sorted(json.loads(ev.missing_skills)) == sorted(expected["missing_skills"])
+        assert ev.final_score == pytest.approx(expected["final_score"])
+
+
+@pytest.mark.parametrize("edit", sorted(EDITS))
+def test_incremental_rescore_matches_full_rescore(db, jd_id, edit):
+    summary = rescoring.update_jd_skills(db, jd_id, EDITS[edit], SCORING_VERSION)
+    assert summary["rescored"] == N_RESUMES
+    db.expire_all()
+    assert_matches_full_rescore(db, jd_id, EDITS[edit])
+
+
+def test_interrupted_rescore_finishes_when_repeated(db, jd_id, monkeypatch):
+    skills = EDITS["add_and_remove"]
+    monkeypatch.setattr(rescoring, "RESCORE_BATCH", 7)
+    calls = {"n": 0}
+    original = rescoring._rescore_row
+
+    def fail_on_fourth_page(*args):
+        calls["n"] += 1
+        if calls["n"] > 3 * 7:
+            raise RuntimeError("interrupted")
+        return original(*args)
+
+    monkeypatch.setattr(rescoring, "_rescore_row", fail_on_fourth_page)
+    with pytest.raises(RuntimeError):
+        rescoring.update_jd_skills(db, jd_id, skills, SCORING_VERSION)
+    db.rollback()
+    monkeypatch.setattr(rescoring, "_rescore_row", original)
+
+    rescoring.update_jd_skills(db, jd_id, skills, SCORING_VERSION)
+    db.expire_all()
+    assert_matches_full_rescore(db, jd_id, skills)
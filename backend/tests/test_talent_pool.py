@@ -0,0 +1,96 @@
+# backend/tests/test_talent_pool.py
+# Talent-pool ranking must agree with compute_relevance for every stored resume,
+# including while a JD's new skills are still being backfilled in the background.
+import random
+import threading
+import time
+
+import pytest
+
+from app.db import SessionLocal, init_db
+from app.main import compute_relevance
+from app.matching import SkillMatcher
+from app.models import Resume
+from app.talent_pool import TalentPool
+
+WORDS = ["python", "sql", "machine", "learning", "docker", "aws", "react", "node.js", "c++", "java",
+         "excel", "team", "led", "built", "the", "and"]
+KNOWN = ["Python", "Docker"]  # already in the vocabulary when the JD arrives
+JD_SKILLS = ["Python", "machine learning", "node.js", "C++", "Docker", "python", "AWS"]
+
+
+@pytest.fixture
+def db():
+    init_db()
+    with SessionLocal() as session:
+        yield session
+
+
+def add_resumes(db, n, seed):
+    rng = random.Random(seed)
+    db.add_all(Resume(filename=f"pool{seed}_{i}.txt", raw_text=" ".join(rng.choices(WORDS, k=rng.randint(0, 40))))
+               for i in range(n))
+    db.commit()
+
+
+def wait_for_backfill(pool, timeout=30):
+    deadline = time.monotonic() + timeout
+    while pool._pending:
+        assert time.monotonic() < deadline, "backfill did not finish"
+        time.sleep(0.01)
+
+
+def expected_scores(db, skills, counted):
+    """resume id -> (score, matched) from compute_relevance, counting only `counted` skills as matchable"""
+    matcher = SkillMatcher(skills)
+    expected = {}
+    for resume_id, text in db.query(Resume.id, Resume.raw_text):
+        result = compute_relevance("", text or "", matcher=matcher, similarity=0.0)
+        matched = [s for s in skills if s in result["matched_skills"] and s in counted]
+        expected[resume_id] = (int(len(matched) / len(skills) * 100), matched)
+    return expected
+
+
+def assert_ranking(db, pool, skills, counted):
+    expected = expected_scores(db, skills, counted)
+    result = pool.top_candidates(db, skills, k=len(expected) + 1)
+    got = {c["resume_id"]: (c["score"], c["matched_skills"]) for c in result["candidates"]}
+    assert got == expected
+    scores = [c["score"] for c in result["candidates"]]
+    assert scores == sorted(scores, reverse=True)
+    return result
+
+
+def test_top_candidates_match_compute_relevance(db, tmp_path, monkeypatch):
+    add_resumes(db, 300, seed=1)
+    pool = TalentPool(str(tmp_path / "pool"))
+    pool.sync(db)
+    pool.request_backfill(KNOWN)
+    wait_for_backfill(pool)
+
+    # Hold the backfill after it has matched the resumes present when it started
+    release = threading.Event()
+    match_stored = pool._match_stored
+
+    def held_match_stored(*args):
+        found = match_stored(*args)
+        if threading.current_thread().name == "talent-pool-backfill":
+            assert release.wait(30)
+        return found
+
+    monkeypatch.setattr(pool, "_match_stored", held_match_stored)
+
+    # Before the backfill finishes: partial, with the new skills counted as missing
+    result = assert_ranking(db, pool, JD_SKILLS, KNOWN + ["python"])
+    assert result["partial"]
+    assert result["pending_skills"] == ["machine learning", "node.js", "C++", "AWS"]
+
+    add_resumes(db, 50, seed=2)  # synced while the backfill is still matching older rows
+    pool.sync(db)
+    assert assert_ranking(db, pool, JD_SKILLS, KNOWN + ["python"])["partial"]
+
+    release.set()
+    wait_for_backfill(pool)
+    result = assert_ranking(db, pool, JD_SKILLS, JD_SKILLS)
+    assert not result["partial"]
+    assert result["pending_skills"] == []
@@ -1,6 +1,10 @@
 import streamlit as st
 import requests
+from requests.adapters import HTTPAdapter
 from io import BytesIO
+import hashlib
+import json
+import pandas as pd
 import pdfplumber
 import docx
 
@@ -43,6 +47,34 @@ st.markdown("""
 
 st.title("Automated Resume Relevance")
 
+# ----------------------------
+# Backend connection: one keep-alive session shared across reruns
+@st.cache_resource
+def get_http_session():
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+    session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+    return session
+
+http = get_http_session()
+
+# jd_id per JD content, so re-clicking doesn't register the same JD again
+if "jd_ids" not in st.session_state:
+    st.session_state.jd_ids = {}
+
+def jd_key(title, jd_text):
+    return hashlib.sha256(f"{title}\n{jd_text}".encode()).hexdigest()
+
+def register_jd(title, jd_text, force=False):
+    key = jd_key(title, jd_text)
+    if not force and key in st.session_state.jd_ids:
+        return st.session_state.jd_ids[key]
+    resp = http.post(f"{BACKEND_URL}/jd", json={"title": title, "jd": jd_text}, timeout=60)
+    resp.raise_for_status()
+    jd_id = resp.json().get("jd_id")
+    st.session_state.jd_ids[key] = jd_id
+    return jd_id
+
 # ----------------------------
 # JD Section
 st.header("Step 1: Enter Job Description (JD)")
@@ -52,87 +84,141 @@ jd_text = st.text_area("Paste Job Description here")
 
 # ----------------------------
 # Resume Section
-st.header("Step 2: Upload Resume")
-st.markdown('<div class="green-gradient">Upload your PDF or DOCX resume file.</div>', unsafe_allow_html=True)
-resume_file = st.file_uploader("Upload Resume (PDF/DOCX)", type=["pdf", "docx"])
+st.header("Step 2: Upload Resumes")
+st.markdown('<div class="green-gradient">Upload one or more PDF or DOCX resume files.</div>', unsafe_allow_html=True)
+resume_files = st.file_uploader("Upload Resumes (PDF/DOCX)", type=["pdf", "docx"], accept_multiple_files=True)
 
 # ----------------------------
-# Extract resume text
-def extract_resume_text(file):
-    if file.name.endswith(".pdf"):
-        file_bytes = BytesIO(file.getvalue())
+# Extract resume text (cached by file content, so reruns don't re-parse)
+@st.cache_data(show_spinner=False, max_entries=500)
+def extract_resume_text(name, file_bytes):
+    if name.endswith(".pdf"):
         text = ""
-        with pdfplumber.open(file_bytes) as pdf:
+        with pdfplumber.open(BytesIO(file_bytes)) as pdf:
             for page in pdf.pages:
                 page_text = page.extract_text()
                 if page_text:
                     text += page_text + "\n"
         return text
-    elif file.name.endswith(".docx"):
-        doc = docx.Document(BytesIO(file.getvalue()))
+    elif name.endswith(".docx"):
+        doc = docx.Document(BytesIO(file_bytes))
         return "\n".join([p.text for p in doc.paragraphs])
     return ""
 
 # ----------------------------
-# Evaluate Resume
-if st.button("Evaluate Resume"):
+# Evaluate all resumes in one streamed /evaluate_batch request
+def evaluate_batch(jd_id, resume_texts, filenames):
+    """Yields one result dict per resume as the backend finishes it (cached results come first)"""
+    resp = http.post(f"{BACKEND_URL}/evaluate_batch",
+                     data={"jd_id": jd_id, "resume_texts": resume_texts, "filenames": filenames},
+                     stream=True, timeout=600)
+    resp.raise_for_status()
+    if resp.headers.get("content-type", "").startswith("application/json"):
+        yield resp.json()  # e.g. {"error": "JD not found"}
+        return
+    for line in resp.iter_lines():
+        if line:
+            yield json.loads(line)
+
+def verdict_class_for(verdict):
+    verdict = verdict.lower()
+    if verdict == "excellent":
+        return "excellent"
+    elif verdict == "very good":
+        return "verygood"
+    elif verdict == "good":
+        return "good"
+    return "bad"
+
+def render_result(result):
+    # Score
+    score = result.get("score", 0)
+    st.subheader("Relevance Score")
+    st.markdown(f"<div class='score-box'>{score} / 100</div>", unsafe_allow_html=True)
+
+    # Verdict
+    verdict = result.get("verdict", "N/A")
+    st.subheader("Verdict")
+    st.markdown(f"<div class='verdict-box {verdict_class_for(verdict)}'>{verdict.title()}</div>", unsafe_allow_html=True)
+
+    # Matched Skills
+    matched_skills = result.get("matched_skills", [])
+    if matched_skills:
+        st.subheader("Matched Skills")
+        for skill in matched_skills:
+            st.markdown(f"<div class='matched-skill'>{skill}</div>", unsafe_allow_html=True)
+
+    # Missing Skills
+    missing_skills = result.get("missing_skills", [])
+    st.subheader("Missing Skills/Elements")
+    if missing_skills:
+        for skill in missing_skills:
+            st.markdown(f"<div class='missing-skill'>{skill}</div>", unsafe_allow_html=True)
+    else:
+        st.success("🎉 All required skills are present!")
+
+def results_table(names, results):
+    rows = []
+    for i, result in sorted(results.items()):
+        rows.append({
+            "Resume": names[i],
+            "Score": result.get("score"),
+            "Verdict": result.get("verdict", result.get("error", "")),
+            "Matched": len(result.get("matched_skills", [])),
+            "Missing": len(result.get("missing_skills", [])),
+            "Semantic": result.get("semantic_score"),
+        })
+    return pd.DataFrame(rows).sort_values("Score", ascending=False, na_position="last")
+
+# ----------------------------
+# Evaluate Resumes
+if st.button("Evaluate Resumes"):
     if not title:
         st.error("🚩 Please enter Job Title.")
     elif not jd_text.strip():
         st.error("🚩 Please paste Job Description text.")
-    elif resume_file is None:
-        st.error("🚩 Please upload your resume file.")
+    elif not resume_files:
+        st.error("🚩 Please upload at least one resume file.")
     else:
-        with st.spinner("🔄 Sending JD..."):
-            jd_resp = requests.post(f"{BACKEND_URL}/jd", json={"title": title, "jd": jd_text})
-        if jd_resp.status_code != 200:
-            st.error(f"Error sending JD: {jd_resp.text}")
-        else:
-            jd_id = jd_resp.json().get("jd_id")
-            st.success(f"JD processed successfully! JD ID: {jd_id}")
-
-            with st.spinner("🔎 Extracting resume text..."):
-                resume_text = extract_resume_text(resume_file)
-
-            with st.spinner("📊 Evaluating resume..."):
-                resume_resp = requests.post(f"{BACKEND_URL}/evaluate_resume",
-                                            json={"jd_id": jd_id, "resume_text": resume_text})
-            if resume_resp.status_code != 200:
-                st.error(f"Error evaluating resume: {resume_resp.text}")
-            else:
-                result = resume_resp.json()
-                st.success("✅ Resume evaluated successfully!")
-
-                # Score
-                score = result.get("score", 0)
-                st.subheader("Relevance Score")
-                st.markdown(f"<div class='score-box'>{score} / 100</div>", unsafe_allow_html=True)
-
-                # Verdict
-                verdict = result.get("verdict", "N/A").lower()
-                verdict_class = "bad"
-                if verdict == "excellent":
-                    verdict_class = "excellent"
-                elif verdict == "very good":
-                    verdict_class = "verygood"
-                elif verdict == "good":
-                    verdict_class = "good"
-
-                st.subheader("Verdict")
-                st.markdown(f"<div class='verdict-box {verdict_class}'>{verdict.title()}</div>", unsafe_allow_html=True)
-
-                # Matched Skills
-                matched_skills = result.get("matched_skills", [])
-                if matched_skills:
-                    st.subheader("Matched Skills")
-                    for skill in matched_skills:
-                        st.markdown(f"<div class='matched-skill'>{skill}</div>", unsafe_allow_html=True)
-
-                # Missing Skills
-                missing_skills = result.get("missing_skills", [])
-                st.subheader("Missing Skills/Elements")
-                if missing_skills:
-                    for skill in missing_skills:
-                        st.markdown(f"<div class='missing-skill'>{skill}</div>", unsafe_allow_html=True)
+        try:
+            with st.spinner("🔄 Sending JD..."):
+                jd_id = register_jd(title, jd_text)
+        except requests.RequestException as e:
+            st.error(f"Error sending JD: {e}")
+            st.stop()
+        st.success(f"JD ready! JD ID: {jd_id}")
+
+        with st.spinner("🔎 Extracting resume text..."):
+            names = [f.name for f in resume_files]
+            texts = [extract_resume_text(f.name, f.getvalue()) for f in resume_files]
+
+        progress = st.progress(0.0, text="📊 Evaluating resumes...")
+        table = st.empty()
+        results = {}
+        try:
+            for attempt in range(2):
+                for item in evaluate_batch(jd_id, texts, names):
+                    if item.get("error") == "JD not found" and "index" not in item:
+                        break
+                    results[item["index"]] = item
+                    progress.progress(len(results) / len(texts), text=f"📊 Evaluated {len(results)} / {len(texts)}")
+                    table.dataframe(results_table(names, results), use_container_width=True, hide_index=True)
                 else:
-                    st.success("🎉 All required skills are present!")
+                    break
+                # Backend no longer knows this JD (e.g. its database was reset): register it again
+                jd_id = register_jd(title, jd_text, force=True)
+        except requests.RequestException as e:
+            st.error(f"Error evaluating resumes: {e}")
+            st.stop()
+
+        if not results:
+            st.error("Error evaluating resumes: JD not found")
+        else:
+            progress.empty()
+            st.success("✅ Resumes evaluated successfully!")
+            for i, result in sorted(results.items(), key=lambda kv: -(kv[1].get("score") or 0)):
+                with st.expander(f"{names[i]} — {result.get('score', 'error')} / 100", expanded=len(results) == 1):
+                    if "error" in result:
+                        st.error(result["error"])
+                    else:
+                        render_result(result)